@@ -0,0 +1,23 @@
+"""
+Revision ID: a7f3d92c15b8
+Revises: 4921b489d295
+Create Date: 2026-09-01 11:30:12.481205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7f3d92c15b8'
+down_revision = '4921b489d295'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'is_active')
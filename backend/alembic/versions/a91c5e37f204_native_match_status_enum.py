@@ -0,0 +1,38 @@
+"""
+Revision ID: a91c5e37f204
+Revises: c47e2f95d8a1
+Create Date: 2026-09-01 14:02:36.451882
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a91c5e37f204'
+down_revision = 'c47e2f95d8a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # String(20) -> native enum; values already match the enum labels.
+    op.execute("CREATE TYPE match_status AS ENUM ('pending', 'accepted', 'confirmed', 'rejected')")
+    op.execute('ALTER TABLE matches ALTER COLUMN status TYPE match_status USING status::match_status')
+    # Re-scope the status index to the live states; terminal matches
+    # only accumulate and are never looked up by status.
+    op.drop_index(op.f('ix_matches_status'), table_name='matches')
+    op.create_index(
+        op.f('ix_matches_status'),
+        'matches',
+        ['status'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('pending', 'accepted')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_matches_status'), table_name='matches')
+    op.execute('ALTER TABLE matches ALTER COLUMN status TYPE VARCHAR(20) USING status::text')
+    op.execute('DROP TYPE match_status')
+    op.create_index(op.f('ix_matches_status'), 'matches', ['status'], unique=False)
@@ -0,0 +1,58 @@
+"""
+Revision ID: b5e90d7c31fa
+Revises: f8d24a61c3b7
+Create Date: 2026-09-01 13:12:45.902138
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e90d7c31fa'
+down_revision = 'f8d24a61c3b7'
+branch_labels = None
+depends_on = None
+
+
+# (table, column) pairs whose defaults move from Python-side
+# datetime.utcnow to the database's now()
+_TIMESTAMP_COLUMNS = (
+    ('users', 'created_at'),
+    ('availability_offers', 'created_at'),
+    ('availability_offers', 'updated_at'),
+    ('availability_requests', 'created_at'),
+    ('availability_requests', 'updated_at'),
+    ('notifications', 'created_at'),
+    ('dogs', 'created_at'),
+    ('user_dogs', 'created_at'),
+    ('matches', 'created_at'),
+    ('matches', 'updated_at'),
+    ('messages', 'created_at'),
+)
+
+
+def upgrade() -> None:
+    # Existing naive values were written as UTC by datetime.utcnow, so
+    # reinterpret them as UTC when widening to timestamptz.
+    for table, column in _TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.DateTime(),
+            type_=sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+
+
+def downgrade() -> None:
+    for table, column in _TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.DateTime(timezone=True),
+            type_=sa.DateTime(),
+            server_default=None,
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
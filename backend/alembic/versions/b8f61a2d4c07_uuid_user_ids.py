@@ -0,0 +1,85 @@
+"""
+Revision ID: b8f61a2d4c07
+Revises: f3a57b28e610
+Create Date: 2026-09-01 15:41:38.294715
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8f61a2d4c07'
+down_revision = 'f3a57b28e610'
+branch_labels = None
+depends_on = None
+
+
+# Every column referencing users.id: (table, column, nullable). The FK
+# constraints carry PostgreSQL's default names (no naming convention
+# was configured when the schema was created).
+_FK_COLUMNS = (
+    ('availability_offers', 'user_id', False),
+    ('availability_requests', 'user_id', False),
+    ('notifications', 'user_id', False),
+    ('user_dogs', 'user_id', False),
+    ('matches', 'pending_user_id', True),
+    ('messages', 'sender_id', False),
+    ('messages', 'recipient_id', False),
+)
+
+
+def upgrade() -> None:
+    # Legacy token_urlsafe ids are not parseable as uuids, so existing
+    # rows are remapped through md5(id)::uuid — deterministic, hence
+    # consistent across every FK column. Only rows created after this
+    # migration get time-ordered UUIDv7 ids; old ids just become
+    # opaque uuids. Sessions embedding old ids in JWTs are invalidated.
+    for table, column, _ in _FK_COLUMNS:
+        op.drop_constraint(f'{table}_{column}_fkey', table, type_='foreignkey')
+
+    for table, column, nullable in _FK_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.Uuid(),
+            existing_nullable=nullable,
+            postgresql_using=f'md5({column})::uuid',
+        )
+    op.alter_column(
+        'users',
+        'id',
+        type_=sa.Uuid(),
+        existing_nullable=False,
+        postgresql_using='md5(id)::uuid',
+    )
+
+    for table, column, _ in _FK_COLUMNS:
+        op.create_foreign_key(f'{table}_{column}_fkey', table, 'users', [column], ['id'])
+
+
+def downgrade() -> None:
+    # Downgrade keeps referential integrity but not the original
+    # token_urlsafe ids (they were consumed by the md5 remap); ids
+    # come back as 32-char hex strings.
+    for table, column, _ in _FK_COLUMNS:
+        op.drop_constraint(f'{table}_{column}_fkey', table, type_='foreignkey')
+
+    op.alter_column(
+        'users',
+        'id',
+        type_=sa.String(length=32),
+        existing_nullable=False,
+        postgresql_using="replace(id::text, '-', '')",
+    )
+    for table, column, nullable in _FK_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(length=32),
+            existing_nullable=nullable,
+            postgresql_using=f"replace({column}::text, '-', '')",
+        )
+
+    for table, column, _ in _FK_COLUMNS:
+        op.create_foreign_key(f'{table}_{column}_fkey', table, 'users', [column], ['id'])
@@ -0,0 +1,35 @@
+"""
+Revision ID: c47e2f95d8a1
+Revises: d19f4c82ab60
+Create Date: 2026-09-01 13:33:52.287716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47e2f95d8a1'
+down_revision = 'd19f4c82ab60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Mirror of ix_messages_conversation for the B→A direction; the two
+    # composites also cover lookups on their leading column, making the
+    # standalone sender/recipient indexes redundant.
+    op.create_index(
+        op.f('ix_messages_conversation_rev'),
+        'messages',
+        ['recipient_id', 'sender_id', 'created_at'],
+        unique=False,
+    )
+    op.drop_index(op.f('ix_messages_sender_id'), table_name='messages')
+    op.drop_index(op.f('ix_messages_recipient_id'), table_name='messages')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_messages_sender_id'), 'messages', ['sender_id'], unique=False)
+    op.create_index(op.f('ix_messages_recipient_id'), 'messages', ['recipient_id'], unique=False)
+    op.drop_index(op.f('ix_messages_conversation_rev'), table_name='messages')
@@ -0,0 +1,29 @@
+"""
+Revision ID: d19f4c82ab60
+Revises: b5e90d7c31fa
+Create Date: 2026-09-01 13:24:19.330571
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd19f4c82ab60'
+down_revision = 'b5e90d7c31fa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f('ix_users_location'),
+        'users',
+        ['location_lat', 'location_lng'],
+        unique=False,
+        postgresql_where=sa.text('location_lat IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_location'), table_name='users')
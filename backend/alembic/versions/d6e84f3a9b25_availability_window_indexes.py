@@ -0,0 +1,35 @@
+"""
+Revision ID: d6e84f3a9b25
+Revises: b8f61a2d4c07
+Create Date: 2026-09-01 16:24:47.651208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6e84f3a9b25'
+down_revision = 'b8f61a2d4c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f('ix_availability_offers_window'),
+        'availability_offers',
+        ['start_at', 'end_at'],
+        unique=False,
+    )
+    op.create_index(
+        op.f('ix_availability_requests_window'),
+        'availability_requests',
+        ['start_at', 'end_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_availability_requests_window'), table_name='availability_requests')
+    op.drop_index(op.f('ix_availability_offers_window'), table_name='availability_offers')
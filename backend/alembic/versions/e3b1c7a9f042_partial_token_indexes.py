@@ -0,0 +1,44 @@
+"""
+Revision ID: e3b1c7a9f042
+Revises: a7f3d92c15b8
+Create Date: 2026-09-01 12:40:31.118264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b1c7a9f042'
+down_revision = 'a7f3d92c15b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Replace the full B-tree indexes on the token columns with partial
+    # ones: almost every row has NULL tokens, so the live index shrinks
+    # by orders of magnitude and ordinary user updates skip it.
+    op.drop_index(op.f('ix_users_email_verification_token'), table_name='users')
+    op.drop_index(op.f('ix_users_password_reset_token'), table_name='users')
+    op.create_index(
+        op.f('ix_users_email_verification_token'),
+        'users',
+        ['email_verification_token'],
+        unique=False,
+        postgresql_where=sa.text('email_verification_token IS NOT NULL'),
+    )
+    op.create_index(
+        op.f('ix_users_password_reset_token'),
+        'users',
+        ['password_reset_token'],
+        unique=False,
+        postgresql_where=sa.text('password_reset_token IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_email_verification_token'), table_name='users')
+    op.drop_index(op.f('ix_users_password_reset_token'), table_name='users')
+    op.create_index(op.f('ix_users_email_verification_token'), 'users', ['email_verification_token'], unique=False)
+    op.create_index(op.f('ix_users_password_reset_token'), 'users', ['password_reset_token'], unique=False)
@@ -0,0 +1,29 @@
+"""
+Revision ID: e72a8b50c914
+Revises: a91c5e37f204
+Create Date: 2026-09-01 14:26:54.107263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e72a8b50c914'
+down_revision = 'a91c5e37f204'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f('ix_notifications_unread'),
+        'notifications',
+        ['user_id', 'created_at'],
+        unique=False,
+        postgresql_where=sa.text('is_read = false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_notifications_unread'), table_name='notifications')
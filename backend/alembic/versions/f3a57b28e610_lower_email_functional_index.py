@@ -0,0 +1,33 @@
+"""
+Revision ID: f3a57b28e610
+Revises: e72a8b50c914
+Create Date: 2026-09-01 15:02:11.482930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a57b28e610'
+down_revision = 'e72a8b50c914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Normalize existing rows first so the case-insensitive unique
+    # index can be built (and so lower(email) == email for every row).
+    op.execute("UPDATE users SET email = lower(email)")
+    op.create_index(
+        op.f('ix_users_email_lower'),
+        'users',
+        [sa.text('lower(email)')],
+        unique=True,
+    )
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.drop_index(op.f('ix_users_email_lower'), table_name='users')
@@ -0,0 +1,61 @@
+"""
+Revision ID: f8d24a61c3b7
+Revises: e3b1c7a9f042
+Create Date: 2026-09-01 12:58:07.664419
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8d24a61c3b7'
+down_revision = 'e3b1c7a9f042'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Token columns now hold SHA-256 digests (32 raw bytes) instead of
+    # the plaintext tokens. Existing in-flight tokens cannot be hashed
+    # retroactively (the raw values are what we're removing), so they
+    # are invalidated; users simply re-request a link.
+    op.execute('UPDATE users SET email_verification_token = NULL, password_reset_token = NULL')
+    op.alter_column(
+        'users',
+        'email_verification_token',
+        existing_type=sa.String(length=64),
+        type_=sa.LargeBinary(length=32),
+        existing_nullable=True,
+        postgresql_using='NULL',
+    )
+    op.alter_column(
+        'users',
+        'password_reset_token',
+        existing_type=sa.String(length=64),
+        type_=sa.LargeBinary(length=32),
+        existing_nullable=True,
+        postgresql_using='NULL',
+    )
+
+
+def downgrade() -> None:
+    # Digests cannot be turned back into tokens; clear and restore the
+    # old column type.
+    op.execute('UPDATE users SET email_verification_token = NULL, password_reset_token = NULL')
+    op.alter_column(
+        'users',
+        'email_verification_token',
+        existing_type=sa.LargeBinary(length=32),
+        type_=sa.String(length=64),
+        existing_nullable=True,
+        postgresql_using='NULL',
+    )
+    op.alter_column(
+        'users',
+        'password_reset_token',
+        existing_type=sa.LargeBinary(length=32),
+        type_=sa.String(length=64),
+        existing_nullable=True,
+        postgresql_using='NULL',
+    )
@@ -10,24 +10,27 @@ Usage:
 	python -m app.admin_cli dogs delete <dog-id>
 	python -m app.admin_cli content moderate --flagged
 """
+import os
+
 import typer
-from rich.console import Console
-from rich.table import Table
-from rich import print as rprint
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
-import sys
-import os
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Tell app.db this is a short-lived CLI process before it is imported:
+# the engine then skips pooling and pre-ping (see db.get_engine)
+os.environ.setdefault("REGAMI_CLI", "1")
+
+def _close_shared_session(*_args, **_kwargs):
+	"""Close the shared session once the invoked command finishes."""
+	if get_db.cache_info().currsize:
+		get_db().close()
 
-from app.db import SessionLocal
-from app.models import User, Dog
-from datetime import datetime
 
-app = typer.Typer(help="Regami Admin CLI - Manage users, dogs, and content")
-console = Console()
+app = typer.Typer(
+	help="Regami Admin CLI - Manage users, dogs, and content",
+	result_callback=_close_shared_session,
+)
 
 # Subcommands
 users_app = typer.Typer(help="User management commands")
@@ -39,13 +42,42 @@ app.add_typer(dogs_app, name="dogs")
 app.add_typer(content_app, name="content")
 
 
+# Heavy imports (rich, SQLAlchemy, the ORM models) are done lazily inside the
+# command bodies so that `--help` and argument parsing don't pay for them.
+
+@lru_cache(maxsize=1)
+def _get_console():
+	"""Create the rich console on first use."""
+	from rich.console import Console
+	return Console()
+
+
+@lru_cache(maxsize=4096)
+def _fmt_date(dt) -> str:
+	"""Cached YYYY-MM-DD rendering for table rows."""
+	return dt.strftime("%Y-%m-%d") if dt else "N/A"
+
+
+def _age_years(birth_month: int, birth_year: int) -> int:
+	"""Age in whole years, mirroring Dog.age_years."""
+	from datetime import date
+
+	today = date.today()
+	age = today.year - birth_year
+	if today.month < birth_month:
+		age -= 1
+	return max(0, age)
+
+
+@lru_cache(maxsize=1)
 def get_db():
-	"""Get database session."""
-	db = SessionLocal()
+	"""Get the database session shared by this CLI invocation."""
+	from app.db import SessionLocal
+
 	try:
-		return db
+		return SessionLocal()
 	except Exception as e:
-		console.print(f"[red]Database connection failed: {e}[/red]")
+		_get_console().print(f"[red]Database connection failed: {e}[/red]")
 		raise typer.Exit(code=1)
 
 
@@ -59,9 +91,16 @@ def list_users(
 	active_only: bool = typer.Option(False, help="Show only active users"),
 ):
 	"""List all users."""
+	from rich.table import Table
+
+	from app.models import User
+
+	console = _get_console()
 	db = get_db()
 
-	query = db.query(User)
+	# Column-only select: rows come back as lightweight tuples instead of
+	# fully hydrated ORM objects
+	query = db.query(User.id, User.email, User.is_active, User.created_at)
 	if active_only:
 		query = query.filter(User.is_active == True)  # noqa: E712
 
@@ -70,26 +109,26 @@ def list_users(
 	table = Table(title=f"Users (showing {len(users)})")
 	table.add_column("ID", style="cyan")
 	table.add_column("Email", style="green")
-	table.add_column("Name", style="yellow")
 	table.add_column("Active", style="magenta")
 	table.add_column("Created", style="blue")
 
-	for user in users:
-		table.add_row(
-			str(user.id),
-			user.email,
-			user.name or "N/A",
-			"✓" if user.is_active else "✗",
-			user.created_at.strftime("%Y-%m-%d") if user.created_at else "N/A"
-		)
+	# Pre-format rows in one comprehension, then feed the table
+	rows = [
+		(str(user_id), user_email, "✓" if is_active else "✗", _fmt_date(created_at))
+		for user_id, user_email, is_active, created_at in users
+	]
+	for row in rows:
+		table.add_row(*row)
 
 	console.print(table)
-	db.close()
 
 
 @users_app.command("info")
 def user_info(email: str = typer.Argument(..., help="User email address")):
 	"""Get detailed user information."""
+	from app.models import User, Dog, UserDog
+
+	console = _get_console()
 	db = get_db()
 
 	user = db.query(User).filter(User.email == email).first()
@@ -97,52 +136,60 @@ def user_info(email: str = typer.Argument(..., help="User email address")):
 		console.print(f"[red]User not found: {email}[/red]")
 		raise typer.Exit(code=1)
 
-	# Get user's dogs
-	dogs = db.query(Dog).filter(Dog.owner_id == user.id).all()
+	# Get user's dogs; only the rendered columns, as lightweight tuples
+	dogs = (
+		db.query(Dog.id, Dog.name, Dog.sex)
+		.join(UserDog, UserDog.dog_id == Dog.id)
+		.filter(UserDog.user_id == user.id)
+		.all()
+	)
 
 	console.print(f"\n[bold cyan]User Information[/bold cyan]")
 	console.print(f"ID: {user.id}")
 	console.print(f"Email: {user.email}")
-	console.print(f"Name: {user.name or 'N/A'}")
-	console.print(f"Phone: {user.phone or 'N/A'}")
 	console.print(f"Active: {'Yes' if user.is_active else 'No'}")
+	console.print(f"Email Verified: {'Yes' if user.email_verified else 'No'}")
 	console.print(f"Created: {user.created_at}")
-	console.print(f"Location: {user.location_address or 'N/A'}")
 	console.print(f"FCM Token: {'Set' if user.fcm_token else 'Not set'}")
 	console.print(f"\n[bold cyan]Dog Profiles ({len(dogs)})[/bold cyan]")
 
-	for dog in dogs:
-		console.print(f"  • {dog.name} (ID: {dog.id}) - {dog.breed or 'Unknown breed'}")
-
-	db.close()
+	for dog_id, dog_name, dog_sex in dogs:
+		console.print(f"  • {dog_name} (ID: {dog_id}) - {dog_sex or 'Unknown'}")
 
 
 @users_app.command("deactivate")
 def deactivate_user(
 	email: str = typer.Argument(..., help="User email to deactivate"),
 	reason: Optional[str] = typer.Option(None, help="Reason for deactivation"),
+	yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
 ):
 	"""Deactivate a user account."""
+	from datetime import datetime
+
+	from app.models import User
+
+	console = _get_console()
 	db = get_db()
 
-	user = db.query(User).filter(User.email == email).first()
-	if not user:
+	# One-column existence/state check; no need to hydrate the full row
+	row = db.query(User.is_active).filter(User.email == email).first()
+	if not row:
 		console.print(f"[red]User not found: {email}[/red]")
 		raise typer.Exit(code=1)
 
-	if not user.is_active:
+	if not row.is_active:
 		console.print(f"[yellow]User is already deactivated: {email}[/yellow]")
-		db.close()
 		return
 
-	# Confirm action
-	confirm = typer.confirm(f"Are you sure you want to deactivate {email}?")
+	# Confirm action (skipped with --yes for scripted/batch use)
+	confirm = yes or typer.confirm(f"Are you sure you want to deactivate {email}?")
 	if not confirm:
 		console.print("[yellow]Cancelled[/yellow]")
-		db.close()
 		return
 
-	user.is_active = False
+	db.query(User).filter(User.email == email).update(
+		{"is_active": False}, synchronize_session=False
+	)
 	db.commit()
 
 	console.print(f"[green]✓ User deactivated: {email}[/green]")
@@ -152,29 +199,66 @@ def deactivate_user(
 	# Log action (in production, this should go to audit log)
 	console.print(f"[dim]Action logged at {datetime.utcnow()}[/dim]")
 
-	db.close()
+
+@users_app.command("deactivate-batch")
+def deactivate_batch(
+	emails_file: Path = typer.Argument(..., help="File with one email per line"),
+	yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
+):
+	"""Deactivate every user listed in a file, in one transaction."""
+	from app.models import User
+
+	console = _get_console()
+
+	emails = [line.strip() for line in emails_file.read_text().splitlines() if line.strip()]
+	if not emails:
+		console.print(f"[yellow]No emails found in {emails_file}[/yellow]")
+		return
+
+	confirm = yes or typer.confirm(f"Are you sure you want to deactivate {len(emails)} users?")
+	if not confirm:
+		console.print("[yellow]Cancelled[/yellow]")
+		return
+
+	db = get_db()
+
+	# One UPDATE for the whole batch instead of a SELECT+UPDATE per user
+	updated = (
+		db.query(User)
+		.filter(User.email.in_(emails))
+		.update({"is_active": False}, synchronize_session=False)
+	)
+	db.commit()
+
+	console.print(f"[green]✓ Deactivated {updated} of {len(emails)} users[/green]")
 
 
 @users_app.command("activate")
 def activate_user(email: str = typer.Argument(..., help="User email to activate")):
 	"""Reactivate a deactivated user account."""
+	from app.models import User
+
+	console = _get_console()
 	db = get_db()
 
-	user = db.query(User).filter(User.email == email).first()
-	if not user:
-		console.print(f"[red]User not found: {email}[/red]")
-		raise typer.Exit(code=1)
+	# Single UPDATE; rowcount doubles as the existence check
+	updated = (
+		db.query(User)
+		.filter(User.email == email, User.is_active == False)  # noqa: E712
+		.update({"is_active": True}, synchronize_session=False)
+	)
+	db.commit()
 
-	if user.is_active:
-		console.print(f"[yellow]User is already active: {email}[/yellow]")
-		db.close()
+	if updated:
+		console.print(f"[green]✓ User activated: {email}[/green]")
 		return
 
-	user.is_active = True
-	db.commit()
-
-	console.print(f"[green]✓ User activated: {email}[/green]")
-	db.close()
+	# Miss path only: distinguish "not found" from "already active"
+	exists = db.query(User.id).filter(User.email == email).first() is not None
+	if not exists:
+		console.print(f"[red]User not found: {email}[/red]")
+		raise typer.Exit(code=1)
+	console.print(f"[yellow]User is already active: {email}[/yellow]")
 
 
 # ====================
@@ -187,39 +271,56 @@ def list_dogs(
 	limit: int = typer.Option(10, help="Number of dogs to show"),
 ):
 	"""List dog profiles."""
+	from rich.table import Table
+
+	from app.models import User, Dog, UserDog
+
+	console = _get_console()
 	db = get_db()
 
-	query = db.query(Dog).join(User)
+	# Single query joining through the ownership link table; avoids a
+	# per-row owner lookup (N+1) and only selects the rendered columns.
+	query = (
+		db.query(Dog.id, Dog.name, Dog.sex, Dog.birth_month, Dog.birth_year, User.email)
+		.join(UserDog, UserDog.dog_id == Dog.id)
+		.join(User, UserDog.user_id == User.id)
+	)
 
 	if owner_email:
 		query = query.filter(User.email == owner_email)
 
-	dogs = query.limit(limit).all()
+	rows = query.limit(limit).all()
 
-	table = Table(title=f"Dog Profiles (showing {len(dogs)})")
+	table = Table(title=f"Dog Profiles (showing {len(rows)})")
 	table.add_column("ID", style="cyan")
 	table.add_column("Name", style="green")
-	table.add_column("Breed", style="yellow")
+	table.add_column("Sex", style="yellow")
 	table.add_column("Age", style="magenta")
 	table.add_column("Owner", style="blue")
 
-	for dog in dogs:
-		owner = db.query(User).filter(User.id == dog.owner_id).first()
-		table.add_row(
-			str(dog.id),
-			dog.name,
-			dog.breed or "Unknown",
-			f"{dog.age_years}y" if dog.age_years else "N/A",
-			owner.email if owner else "Unknown"
+	# Pre-format rows in one comprehension, then feed the table
+	formatted = [
+		(
+			str(dog_id),
+			dog_name,
+			dog_sex or "Unknown",
+			f"{_age_years(birth_month, birth_year)}y",
+			owner_email_col or "Unknown",
 		)
+		for dog_id, dog_name, dog_sex, birth_month, birth_year, owner_email_col in rows
+	]
+	for row in formatted:
+		table.add_row(*row)
 
 	console.print(table)
-	db.close()
 
 
 @dogs_app.command("info")
 def dog_info(dog_id: int = typer.Argument(..., help="Dog profile ID")):
 	"""Get detailed dog profile information."""
+	from app.models import User, Dog, UserDog
+
+	console = _get_console()
 	db = get_db()
 
 	dog = db.query(Dog).filter(Dog.id == dog_id).first()
@@ -227,38 +328,38 @@ def dog_info(dog_id: int = typer.Argument(..., help="Dog profile ID")):
 		console.print(f"[red]Dog profile not found: {dog_id}[/red]")
 		raise typer.Exit(code=1)
 
-	owner = db.query(User).filter(User.id == dog.owner_id).first()
+	owner = (
+		db.query(User)
+		.join(UserDog, UserDog.user_id == User.id)
+		.filter(UserDog.dog_id == dog.id)
+		.first()
+	)
 
 	console.print(f"\n[bold cyan]Dog Profile[/bold cyan]")
 	console.print(f"ID: {dog.id}")
 	console.print(f"Name: {dog.name}")
-	console.print(f"Breed: {dog.breed or 'Unknown'}")
-	console.print(f"Age: {dog.age_years} years, {dog.age_months} months")
 	console.print(f"Sex: {dog.sex or 'Unknown'}")
-	console.print(f"Size: {dog.size or 'Unknown'}")
-	console.print(f"Temperament: {dog.temperament or 'N/A'}")
-	console.print(f"Energy Level: {dog.energy_level or 'N/A'}")
-	console.print(f"Good with Dogs: {'Yes' if dog.good_with_dogs else 'No'}")
-	console.print(f"Good with Cats: {'Yes' if dog.good_with_cats else 'No'}")
-	console.print(f"Good with Kids: {'Yes' if dog.good_with_kids else 'No'}")
-	console.print(f"Vaccinated: {'Yes' if dog.vaccinated else 'Unknown'}")
-	console.print(f"Neutered: {'Yes' if dog.neutered else 'Unknown'}")
+	console.print(f"Age: {dog.age_years} years")
+	console.print(f"Born: {dog.birth_month:02d}/{dog.birth_year}")
 	console.print(f"Photo: {dog.photo_url or 'No photo'}")
-	console.print(f"Bio: {dog.bio or 'No bio'}")
+	console.print(f"Created: {dog.created_at}")
 	console.print(f"\n[bold cyan]Owner[/bold cyan]")
 	if owner:
 		console.print(f"Email: {owner.email}")
-		console.print(f"Name: {owner.name or 'N/A'}")
-
-	db.close()
 
 
 @dogs_app.command("delete")
 def delete_dog(
 	dog_id: int = typer.Argument(..., help="Dog profile ID to delete"),
 	reason: Optional[str] = typer.Option(None, help="Reason for deletion"),
+	yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
 ):
 	"""Delete a dog profile (use for inappropriate content)."""
+	from datetime import datetime
+
+	from app.models import Dog
+
+	console = _get_console()
 	db = get_db()
 
 	dog = db.query(Dog).filter(Dog.id == dog_id).first()
@@ -270,13 +371,11 @@ def delete_dog(
 	console.print(f"\n[bold yellow]Profile to delete:[/bold yellow]")
 	console.print(f"ID: {dog.id}")
 	console.print(f"Name: {dog.name}")
-	console.print(f"Owner ID: {dog.owner_id}")
 
-	# Confirm action
-	confirm = typer.confirm(f"Are you sure you want to delete this dog profile?")
+	# Confirm action (skipped with --yes for scripted/batch use)
+	confirm = yes or typer.confirm(f"Are you sure you want to delete this dog profile?")
 	if not confirm:
 		console.print("[yellow]Cancelled[/yellow]")
-		db.close()
 		return
 
 	db.delete(dog)
@@ -289,8 +388,6 @@ def delete_dog(
 	# Log action (in production, this should go to audit log)
 	console.print(f"[dim]Action logged at {datetime.utcnow()}[/dim]")
 
-	db.close()
-
 
 # ====================
 # Content Moderation
@@ -299,11 +396,22 @@ def delete_dog(
 @content_app.command("stats")
 def content_stats():
 	"""Show content statistics."""
+	from sqlalchemy import func, select
+
+	from app.models import User, Dog
+
+	console = _get_console()
 	db = get_db()
 
-	total_users = db.query(User).count()
-	active_users = db.query(User).filter(User.is_active == True).count()
-	total_dogs = db.query(Dog).count()
+	# All three counts in a single round trip, using direct aggregates
+	# (no SELECT-count-from-subquery wrapper)
+	total_users, active_users, total_dogs = db.execute(
+		select(
+			func.count(User.id).label("total"),
+			func.count(User.id).filter(User.is_active).label("active"),
+			select(func.count(Dog.id)).scalar_subquery().label("dogs"),
+		)
+	).one()
 
 	console.print(f"\n[bold cyan]Content Statistics[/bold cyan]")
 	console.print(f"Total Users: {total_users}")
@@ -311,17 +419,19 @@ def content_stats():
 	console.print(f"Inactive Users: {total_users - active_users}")
 	console.print(f"Total Dog Profiles: {total_dogs}")
 
-	db.close()
-
 
 @content_app.command("recent")
 def recent_content(
 	days: int = typer.Option(7, help="Number of days to look back"),
 ):
 	"""Show recently created content."""
+	from datetime import datetime, timedelta
+
+	from app.models import User, Dog, UserDog
+
+	console = _get_console()
 	db = get_db()
 
-	from datetime import timedelta
 	cutoff = datetime.utcnow() - timedelta(days=days)
 
 	recent_users = db.query(User).filter(User.created_at >= cutoff).all()
@@ -338,11 +448,16 @@ def recent_content(
 
 	if recent_dogs:
 		console.print(f"\n[bold]Recent Dog Profiles:[/bold]")
-		for dog in recent_dogs[:5]:  # Show first 5
-			owner = db.query(User).filter(User.id == dog.owner_id).first()
-			console.print(f"  • {dog.name} by {owner.email if owner else 'Unknown'}")
-
-	db.close()
+		shown = recent_dogs[:5]  # Show first 5
+		# One query for all shown owners instead of one per dog (N+1)
+		owners = dict(
+			db.query(UserDog.dog_id, User.email)
+			.join(User, UserDog.user_id == User.id)
+			.filter(UserDog.dog_id.in_([d.id for d in shown]))
+			.all()
+		)
+		for dog in shown:
+			console.print(f"  • {dog.name} by {owners.get(dog.id, 'Unknown')}")
 
 
 if __name__ == "__main__":
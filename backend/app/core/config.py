@@ -1,12 +1,12 @@
-from pydantic import Field
-from pydantic_settings import BaseSettings
-from functools import lru_cache
+from pydantic import Field, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import cache, cached_property
 import secrets
 
 
 class Settings(BaseSettings):
     app_name: str = "Regami API"
-    secret_key: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
+    secret_key: str = Field(default="")
     access_token_expire_minutes: int = Field(default=60)
     database_url: str = Field(default="sqlite:///./regami.db")
     # Database connection settings
@@ -37,28 +37,71 @@ class Settings(BaseSettings):
     # Basic Auth for staging (optional)
     basic_auth_username: str | None = Field(default=None)
     basic_auth_password: str | None = Field(default=None)
-
-    class Config:
-        env_file = ".env"
-        extra = "ignore"
-
-
-@lru_cache
+    # Logging
+    enable_stack_info: bool = Field(default=False)  # Render stack_info= in log events
+    # Optional subsystems; disabling skips their imports at startup
+    enable_metrics: bool = Field(default=True)  # Prometheus /metrics endpoint
+    fcm_enabled: bool = Field(default=True)  # Firebase push notifications
+
+    @model_validator(mode="before")
+    @classmethod
+    def _default_secret_key(cls, values: dict) -> dict:
+        # Generate a per-process key only when none was configured; prod
+        # requires an explicit key (validate_production_config raises on
+        # the empty default). Keeps SECRET_KEY-from-env startups free of
+        # the urandom call.
+        if isinstance(values, dict) and not values.get("secret_key"):
+            if values.get("app_env", "dev") != "prod":
+                values["secret_key"] = secrets.token_urlsafe(32)
+        return values
+
+    @cached_property
+    def cors_origins_list(self) -> tuple[str, ...]:
+        """cors_origins parsed once into a tuple of cleaned origins."""
+        return tuple(o.strip() for o in self.cors_origins.split(",") if o.strip())
+
+    @cached_property
+    def frontend_url(self) -> str:
+        """First CORS origin, used as the base for emailed links."""
+        origins = self.cors_origins_list
+        return origins[0] if origins else "http://localhost:5173"
+
+    # Frozen: settings are immutable after construction, which makes the
+    # cached_property above safe to share.
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+
+@cache
 def get_settings() -> Settings:
     return Settings()
 
 
-settings = get_settings()
+def __getattr__(name: str) -> Settings:
+    # PEP 562: `settings` stays importable but is only materialized on
+    # first access, so importing this module no longer pays env-file
+    # parsing and validation (important for CLI/--help cold starts).
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def reload_settings() -> None:
     get_settings.cache_clear()  # type: ignore[attr-defined]
-    global settings
-    settings = get_settings()
 
 
+# Origins allowed to stay on plain/localhost HTTPS in production
+_LOCAL_HTTPS = frozenset({'https://localhost', 'https://127.0.0.1'})
+
+
+@cache
 def validate_production_config() -> None:
-    """Validate critical configuration for production environments."""
+    """Validate critical configuration for production environments.
+
+    Memoized: settings are frozen for the process lifetime, so repeat
+    invocations are free (failures re-raise since exceptions are never
+    cached).
+    """
+    settings = get_settings()
     if settings.app_env == "prod":
         # Ensure strong secret key in production
         if len(settings.secret_key) < 32:
@@ -69,16 +112,16 @@ def validate_production_config() -> None:
             print("WARNING: Using SQLite in production is not recommended. Use PostgreSQL.")
 
         # Validate CORS configuration in production
-        origins = [o.strip() for o in settings.cors_origins.split(',') if o.strip()]
+        origins = settings.cors_origins_list
 
         # Check for wildcard origins (security risk)
         if '*' in origins:
             raise ValueError("CORS_ORIGINS cannot contain wildcard '*' in production")
 
-        # Ensure HTTPS-only origins
-        for origin in origins:
-            if not origin.startswith('https://') and origin not in ['https://localhost', 'https://127.0.0.1']:
-                print(f"WARNING: CORS origin '{origin}' should use HTTPS in production")
+        # Ensure HTTPS-only origins: one pass, one warning line
+        insecure = [o for o in origins if not o.startswith('https://') and o not in _LOCAL_HTTPS]
+        if insecure:
+            print(f"WARNING: CORS origins should use HTTPS in production: {', '.join(insecure)}")
 
         # Ensure at least one origin is configured
         if not origins:
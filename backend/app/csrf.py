@@ -21,12 +21,18 @@ read the CSRF token to include it in the header.
 import secrets
 from typing import Optional
 from fastapi import Request, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse
 from starlette.responses import Response
 
 
 # Methods that require CSRF validation
-STATE_CHANGING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+STATE_CHANGING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# Length of a server-issued token: len(secrets.token_urlsafe(32))
+_CSRF_TOKEN_LEN = 43
+
+# Prebuilt failure body; shared across responses
+_CSRF_FAIL_BODY = {"detail": "CSRF token validation failed. Missing or invalid token."}
 
 # Paths that don't require CSRF validation
 CSRF_EXEMPT_PATHS = {
@@ -76,8 +82,13 @@ def validate_csrf_token(request: Request) -> bool:
 
     Returns False if validation fails.
     """
-    # Safe methods don't need CSRF validation
-    if request.method not in STATE_CHANGING_METHODS:
+    # Safe methods don't need CSRF validation. First-letter check is a
+    # fast path for GET/HEAD/OPTIONS (no set hashing); the set lookup
+    # below stays authoritative for anything else.
+    method = request.method
+    if method[0] in ("G", "H", "O"):
+        return True
+    if method not in STATE_CHANGING_METHODS:
         return True
 
     # Check if path is exempt
@@ -93,32 +104,51 @@ def validate_csrf_token(request: Request) -> bool:
     if not cookie_token or not header_token:
         return False
 
-    # Use constant-time comparison to prevent timing attacks
-    return secrets.compare_digest(cookie_token, header_token)
+    # Server-issued tokens always have the same length; reject anything
+    # else up front. Lengths aren't secret here (both tokens come from
+    # us), and compare_digest is constant-time on equal-length inputs.
+    if len(cookie_token) != _CSRF_TOKEN_LEN or len(header_token) != _CSRF_TOKEN_LEN:
+        return False
+
+    # Use constant-time comparison to prevent timing attacks; the bytes
+    # path of compare_digest is faster than the str path
+    try:
+        return secrets.compare_digest(
+            cookie_token.encode("ascii"), header_token.encode("ascii")
+        )
+    except UnicodeEncodeError:
+        return False
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+class CSRFMiddleware:
     """
     Middleware to validate CSRF tokens on state-changing requests.
 
     This middleware checks that state-changing requests (POST, PUT, PATCH, DELETE)
     include a valid CSRF token in the X-CSRF-Token header that matches the
     csrf_token cookie.
+
+    Implemented as pure ASGI: validation only needs headers, so there is
+    no reason to pay BaseHTTPMiddleware's response-streaming bridge.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        # Validate CSRF token for state-changing requests
-        if not validate_csrf_token(request):
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        # Validate CSRF token for state-changing requests (Request is a
+        # thin scope wrapper; the body is never read here)
+        if scope["type"] == "http" and not validate_csrf_token(Request(scope)):
             # Return 403 Forbidden for CSRF validation failure
-            from fastapi.responses import JSONResponse
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
-                content={"detail": "CSRF token validation failed. Missing or invalid token."}
+                content=_CSRF_FAIL_BODY,
             )
+            await response(scope, receive, send)
+            return
 
         # Token is valid or validation not required, proceed with request
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
 
 def set_csrf_cookie(response: Response, token: Optional[str] = None) -> str:
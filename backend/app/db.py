@@ -1,12 +1,16 @@
-from sqlalchemy import create_engine, event
+import os
+from functools import cache
+
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 
-from .core.config import settings
+from .core.config import get_settings
 
 
 def _get_connect_args() -> dict:
     """Get database-specific connection arguments with timeouts."""
+    settings = get_settings()
     db_url = settings.database_url.lower()
 
     if "sqlite" in db_url:
@@ -35,33 +39,89 @@ def _get_connect_args() -> dict:
 def _get_pool_class():
     """Get appropriate pool class based on database type."""
     # SQLite requires StaticPool for in-memory databases or single-threaded access
-    if "sqlite" in settings.database_url.lower() and ":memory:" in settings.database_url:
+    database_url = get_settings().database_url
+    if "sqlite" in database_url.lower() and ":memory:" in database_url:
         return StaticPool
     return QueuePool
 
 
-# Configure database engine with connection pooling and timeouts
-# See: https://docs.sqlalchemy.org/en/20/core/pooling.html
-engine = create_engine(
-    settings.database_url,
-    future=True,
-    # Connection pooling configuration
-    poolclass=_get_pool_class(),
-    pool_size=settings.db_pool_size,  # Number of connections to keep open
-    max_overflow=settings.db_max_overflow,  # Max additional connections beyond pool_size
-    pool_timeout=settings.db_pool_timeout,  # Seconds to wait before giving up on getting a connection
-    pool_recycle=settings.db_pool_recycle,  # Recycle connections after N seconds (prevents stale connections)
-    pool_pre_ping=True,  # Verify connections before using them
-    # Database-specific connection arguments (timeouts, etc.)
-    connect_args=_get_connect_args(),
-    # Echo SQL queries in dev mode (disabled in production for performance)
-    echo=settings.app_env == "dev" and settings.database_url != "sqlite:///./regami.db",
+@cache
+def get_engine():
+    """Create the database engine on first use.
+
+    Deferring create_engine keeps 'import app.db' free of driver import
+    and pool construction for code paths that never touch the database
+    (e.g. the admin CLI's --help).
+
+    Connection pooling and timeouts per
+    https://docs.sqlalchemy.org/en/20/core/pooling.html
+    """
+    settings = get_settings()
+    pool_class = _get_pool_class()
+    cli_mode = os.environ.get("REGAMI_CLI") == "1"
+
+    if cli_mode and pool_class is QueuePool:
+        # Short-lived CLI process: one connection, then exit. A warm pool
+        # and the pre-ping SELECT 1 round trip are dead weight here.
+        pool_kwargs = {"poolclass": NullPool}
+    else:
+        pool_kwargs = {
+            # Connection pooling configuration
+            "poolclass": pool_class,
+            "pool_size": settings.db_pool_size,  # Number of connections to keep open
+            "max_overflow": settings.db_max_overflow,  # Max additional connections beyond pool_size
+            "pool_timeout": settings.db_pool_timeout,  # Seconds to wait before giving up on getting a connection
+            "pool_recycle": settings.db_pool_recycle,  # Recycle connections after N seconds (prevents stale connections)
+            "pool_pre_ping": True,  # Verify connections before using them
+        }
+
+    # Bare postgresql:// URLs default to the psycopg2 dialect; steer
+    # them onto psycopg (v3), which is where SQLAlchemy's recent
+    # insert-batching work lands and which can pipeline round-trips.
+    database_url = settings.database_url
+    if database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+psycopg://", 1)
+
+    return create_engine(
+        database_url,
+        future=True,
+        # Database-specific connection arguments (timeouts, etc.)
+        connect_args=_get_connect_args(),
+        # Echo SQL queries in dev mode (disabled in production for
+        # performance, and for the CLI where per-query log formatting
+        # only slows commands down)
+        echo=(
+            not cli_mode
+            and settings.app_env == "dev"
+            and settings.database_url != "sqlite:///./regami.db"
+        ),
+        **pool_kwargs,
+    )
+
+
+# expire_on_commit=False: handlers return ORM objects right after
+# commit; keeping attributes live avoids a re-SELECT per object that
+# the default expiry would otherwise trigger on first access.
+_session_factory = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, future=True
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
 
+def SessionLocal():
+    """Create a session bound to the lazily constructed engine."""
+    return _session_factory(bind=get_engine())
+
+
+def __getattr__(name: str):
+    # Backwards compat: `engine` stays importable but is only built on
+    # first access (PEP 562).
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_db():
     db = SessionLocal()
     try:
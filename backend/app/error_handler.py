@@ -13,52 +13,152 @@ Security Features:
 - Maps common errors to user-friendly messages
 """
 
+import json
 import logging
+import re
 import traceback
-from typing import Dict, Optional, Any
-from fastapi import Request, status
+from typing import Dict, Final, Optional, Any
+from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError, OperationalError, DataError
 from pydantic import ValidationError
 
+from .core.config import get_settings
+
 logger = logging.getLogger(__name__)
 
+# Environment is fixed for the process lifetime (settings are frozen),
+# so resolve it once instead of importing settings on every error
+_IS_PROD: bool = get_settings().app_env == "prod"
+
+
+def refresh_env() -> None:
+    """Re-read app_env after reload_settings(); mainly for tests."""
+    global _IS_PROD
+    _IS_PROD = get_settings().app_env == "prod"
+
+
+# User-friendly error messages for common scenarios, as module-level
+# constants: the hot handlers reference these directly so every
+# exception skips a dict hash+probe.
+
+# Authentication & Authorization
+_MSG_INVALID_CREDENTIALS: Final = "Identifiants invalides / Invalid credentials"
+_MSG_UNAUTHORIZED: Final = "Non autorisé / Unauthorized"
+_MSG_FORBIDDEN: Final = "Accès interdit / Forbidden"
+_MSG_TOKEN_EXPIRED: Final = "Session expirée / Session expired"
+_MSG_INVALID_TOKEN: Final = "Jeton invalide / Invalid token"
+
+# Database & Data
+_MSG_DUPLICATE: Final = "Cette entrée existe déjà / This entry already exists"
+_MSG_NOT_FOUND: Final = "Ressource introuvable / Resource not found"
+_MSG_DATABASE_ERROR: Final = "Erreur de base de données / Database error"
+_MSG_CONSTRAINT: Final = "Violation de contrainte / Constraint violation"
+
+# Validation
+_MSG_VALIDATION: Final = "Données invalides / Invalid data"
+_MSG_MISSING_FIELD: Final = "Champ requis manquant / Required field missing"
+_MSG_INVALID_FORMAT: Final = "Format invalide / Invalid format"
+_MSG_VALUE_TOO_LARGE: Final = "Valeur trop grande / Value too large"
+
+# File Operations
+_MSG_FILE_TOO_LARGE: Final = "Fichier trop volumineux (max 10MB) / File too large (max 10MB)"
+_MSG_INVALID_FILE_TYPE: Final = "Type de fichier invalide / Invalid file type"
+_MSG_FILE_NOT_FOUND: Final = "Fichier introuvable / File not found"
 
-# User-friendly error messages for common scenarios
+# Rate Limiting
+_MSG_RATE_LIMIT: Final = "Trop de requêtes. Veuillez réessayer plus tard / Too many requests. Please try again later"
+
+# CSRF
+_MSG_CSRF_FAILED: Final = "Échec de validation CSRF / CSRF validation failed"
+
+# Generic
+_MSG_INTERNAL: Final = "Erreur interne du serveur / Internal server error"
+_MSG_SERVICE_UNAVAILABLE: Final = "Service temporairement indisponible / Service temporarily unavailable"
+
+# Keyed view kept for callers outside the hot path (and backwards compat)
 ERROR_MESSAGES = {
-    # Authentication & Authorization
-    "invalid_credentials": "Identifiants invalides / Invalid credentials",
-    "unauthorized": "Non autorisé / Unauthorized",
-    "forbidden": "Accès interdit / Forbidden",
-    "token_expired": "Session expirée / Session expired",
-    "invalid_token": "Jeton invalide / Invalid token",
-
-    # Database & Data
-    "duplicate_entry": "Cette entrée existe déjà / This entry already exists",
-    "not_found": "Ressource introuvable / Resource not found",
-    "database_error": "Erreur de base de données / Database error",
-    "constraint_violation": "Violation de contrainte / Constraint violation",
-
-    # Validation
-    "validation_error": "Données invalides / Invalid data",
-    "missing_field": "Champ requis manquant / Required field missing",
-    "invalid_format": "Format invalide / Invalid format",
-    "value_too_large": "Valeur trop grande / Value too large",
-
-    # File Operations
-    "file_too_large": "Fichier trop volumineux (max 10MB) / File too large (max 10MB)",
-    "invalid_file_type": "Type de fichier invalide / Invalid file type",
-    "file_not_found": "Fichier introuvable / File not found",
-
-    # Rate Limiting
-    "rate_limit_exceeded": "Trop de requêtes. Veuillez réessayer plus tard / Too many requests. Please try again later",
-
-    # CSRF
-    "csrf_failed": "Échec de validation CSRF / CSRF validation failed",
-
-    # Generic
-    "internal_error": "Erreur interne du serveur / Internal server error",
-    "service_unavailable": "Service temporairement indisponible / Service temporarily unavailable",
+    "invalid_credentials": _MSG_INVALID_CREDENTIALS,
+    "unauthorized": _MSG_UNAUTHORIZED,
+    "forbidden": _MSG_FORBIDDEN,
+    "token_expired": _MSG_TOKEN_EXPIRED,
+    "invalid_token": _MSG_INVALID_TOKEN,
+    "duplicate_entry": _MSG_DUPLICATE,
+    "not_found": _MSG_NOT_FOUND,
+    "database_error": _MSG_DATABASE_ERROR,
+    "constraint_violation": _MSG_CONSTRAINT,
+    "validation_error": _MSG_VALIDATION,
+    "missing_field": _MSG_MISSING_FIELD,
+    "invalid_format": _MSG_INVALID_FORMAT,
+    "value_too_large": _MSG_VALUE_TOO_LARGE,
+    "file_too_large": _MSG_FILE_TOO_LARGE,
+    "invalid_file_type": _MSG_INVALID_FILE_TYPE,
+    "file_not_found": _MSG_FILE_NOT_FOUND,
+    "rate_limit_exceeded": _MSG_RATE_LIMIT,
+    "csrf_failed": _MSG_CSRF_FAILED,
+    "internal_error": _MSG_INTERNAL,
+    "service_unavailable": _MSG_SERVICE_UNAVAILABLE,
+}
+
+# Status-code sanitization map for handle_http_exception: one dict
+# lookup instead of an if/elif chain per HTTP error
+_STATUS_TO_MSG: Final[Dict[int, str]] = {
+    status.HTTP_401_UNAUTHORIZED: _MSG_UNAUTHORIZED,
+    status.HTTP_403_FORBIDDEN: _MSG_FORBIDDEN,
+    status.HTTP_404_NOT_FOUND: _MSG_NOT_FOUND,
+    status.HTTP_429_TOO_MANY_REQUESTS: _MSG_RATE_LIMIT,
+}
+
+
+# Pre-encoded response body templates for the statically sanitized
+# status codes: the hot 401/404/429 paths splice the request id into
+# ready-made bytes instead of JSON-encoding a dict per response.
+# Request ids are generated by our middleware (hex/uuid), validated
+# below before splicing so arbitrary values can't break the JSON.
+_RESPONSE_BODY_TPL: Final[Dict[int, bytes]] = {
+    code: ('{"detail":%s,"request_id":"%%s"}' % json.dumps(msg, ensure_ascii=False)).encode()
+    for code, msg in _STATUS_TO_MSG.items()
+}
+_REQUEST_ID_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+# Precompiled case-insensitive scans: one pass over the message, no
+# intermediate .lower() copy
+_DUP_RE = re.compile(r"unique constraint|duplicate", re.IGNORECASE)
+_SIZE_RE = re.compile(r"too (?:long|large)", re.IGNORECASE)
+
+
+def _sanitize_integrity(error: Exception, include_details: bool) -> str:
+    # Database integrity errors often contain sensitive schema info
+    if _DUP_RE.search(str(error)):
+        return _MSG_DUPLICATE
+    return _MSG_CONSTRAINT
+
+
+def _sanitize_data(error: Exception, include_details: bool) -> str:
+    # Data type/format errors
+    if _SIZE_RE.search(str(error)):
+        return _MSG_VALUE_TOO_LARGE
+    return _MSG_VALIDATION
+
+
+def _sanitize_validation(error: Exception, include_details: bool) -> str:
+    # Pydantic validation errors: show details only in development
+    if include_details:
+        return f"{_MSG_VALIDATION}: {error}"
+    return _MSG_VALIDATION
+
+
+# Exact exception type -> sanitizer dispatch. A single dict probe on
+# type(error) replaces the isinstance chain for the common cases; the
+# MRO walk below keeps subclass behaviour identical.
+_SANITIZERS: Final[Dict[type, Any]] = {
+    IntegrityError: _sanitize_integrity,
+    OperationalError: lambda error, include_details: _MSG_DATABASE_ERROR,
+    DataError: _sanitize_data,
+    ValidationError: _sanitize_validation,
+    ValueError: lambda error, include_details: _MSG_INVALID_FORMAT,
+    FileNotFoundError: lambda error, include_details: _MSG_FILE_NOT_FOUND,
+    PermissionError: lambda error, include_details: _MSG_FORBIDDEN,
 }
 
 
@@ -73,49 +173,24 @@ def sanitize_error_message(error: Exception, include_details: bool = False) -> s
     Returns:
         User-friendly error message
     """
-    error_str = str(error)
-    error_type = type(error).__name__
-
-    # Map specific error types to user-friendly messages
-    if isinstance(error, IntegrityError):
-        # Database integrity errors often contain sensitive schema info
-        if "UNIQUE constraint" in error_str or "duplicate" in error_str.lower():
-            return ERROR_MESSAGES["duplicate_entry"]
-        return ERROR_MESSAGES["constraint_violation"]
-
-    elif isinstance(error, OperationalError):
-        # Database connection/operational errors
-        return ERROR_MESSAGES["database_error"]
-
-    elif isinstance(error, DataError):
-        # Data type/format errors
-        if "too long" in error_str.lower() or "too large" in error_str.lower():
-            return ERROR_MESSAGES["value_too_large"]
-        return ERROR_MESSAGES["validation_error"]
-
-    elif isinstance(error, ValidationError):
-        # Pydantic validation errors
-        if include_details:
-            # In development, show validation details
-            return f"{ERROR_MESSAGES['validation_error']}: {error_str}"
-        return ERROR_MESSAGES["validation_error"]
-
-    elif isinstance(error, ValueError):
-        # Generic value errors
-        return ERROR_MESSAGES["invalid_format"]
-
-    elif isinstance(error, FileNotFoundError):
-        return ERROR_MESSAGES["file_not_found"]
-
-    elif isinstance(error, PermissionError):
-        return ERROR_MESSAGES["forbidden"]
+    # Fast path: exact type match
+    handler = _SANITIZERS.get(type(error))
+    if handler is None:
+        # Subclasses of a handled type dispatch via the MRO
+        for base in type(error).__mro__:
+            handler = _SANITIZERS.get(base)
+            if handler is not None:
+                break
+
+    if handler is not None:
+        return handler(error, include_details)
 
     # Default to generic error message
     if include_details:
         # In development, show the error type and message
-        return f"{error_type}: {error_str}"
+        return f"{type(error).__name__}: {error}"
 
-    return ERROR_MESSAGES["internal_error"]
+    return _MSG_INTERNAL
 
 
 def sanitize_error_details(error: Exception) -> Dict[str, Any]:
@@ -153,10 +228,8 @@ def get_error_response(
     Returns:
         JSONResponse with sanitized error
     """
-    from .core.config import settings
-
     # Determine if we should include detailed errors
-    include_details = settings.app_env != "prod"
+    include_details = not _IS_PROD
 
     # Get request ID for correlation
     request_id = getattr(request.state, "request_id", "unknown")
@@ -169,7 +242,9 @@ def get_error_response(
 
     # Log the full error with stack trace for debugging
     logger.error(
-        f"Error handling request {request.method} {request.url.path}",
+        "Error handling request %s %s",
+        request.method,
+        request.url.path,
         extra={
             "request_id": request_id,
             "error_type": type(error).__name__,
@@ -190,8 +265,12 @@ def get_error_response(
         response_data["debug"] = {
             "error_type": type(error).__name__,
             "error_message": str(error),
-            # Only include stack trace in development
-            "stack_trace": traceback.format_exc().split("\n")[:10],  # Limit to 10 lines
+            # Only include stack trace in development; limit= walks just
+            # the first frames instead of formatting the whole trace and
+            # slicing it afterwards
+            "stack_trace": traceback.format_exception(
+                type(error), error, error.__traceback__, limit=10
+            ),
         }
 
     return JSONResponse(
@@ -200,7 +279,7 @@ def get_error_response(
     )
 
 
-def handle_http_exception(request: Request, exc: Exception) -> JSONResponse:
+def handle_http_exception(request: Request, exc: Exception) -> Response:
     """
     Handle FastAPI HTTPException with sanitized messages.
 
@@ -209,7 +288,7 @@ def handle_http_exception(request: Request, exc: Exception) -> JSONResponse:
         exc: The HTTPException
 
     Returns:
-        JSONResponse with sanitized error
+        Response with sanitized error
     """
     from fastapi import HTTPException
 
@@ -217,25 +296,25 @@ def handle_http_exception(request: Request, exc: Exception) -> JSONResponse:
         status_code = exc.status_code
         detail = exc.detail
 
-        # Sanitize certain error messages based on status code
-        if status_code == status.HTTP_401_UNAUTHORIZED:
-            detail = ERROR_MESSAGES["unauthorized"]
-        elif status_code == status.HTTP_403_FORBIDDEN:
-            # Check if it's a CSRF error
-            if "CSRF" in str(detail):
-                detail = ERROR_MESSAGES["csrf_failed"]
-            else:
-                detail = ERROR_MESSAGES["forbidden"]
-        elif status_code == status.HTTP_404_NOT_FOUND:
-            detail = ERROR_MESSAGES["not_found"]
-        elif status_code == status.HTTP_429_TOO_MANY_REQUESTS:
-            detail = ERROR_MESSAGES["rate_limit_exceeded"]
+        request_id = getattr(request.state, "request_id", "unknown")
+
+        # Sanitize certain error messages based on status code: the
+        # statically sanitized statuses serve a pre-encoded body (CSRF
+        # failures never get here -- the middleware responds directly)
+        template = _RESPONSE_BODY_TPL.get(status_code)
+        if template is not None and _REQUEST_ID_RE.fullmatch(request_id):
+            return Response(
+                content=template % request_id.encode(),
+                status_code=status_code,
+                media_type="application/json",
+            )
+        detail = _STATUS_TO_MSG.get(status_code, detail)
 
         return JSONResponse(
             status_code=status_code,
             content={
                 "detail": detail,
-                "request_id": getattr(request.state, "request_id", "unknown")
+                "request_id": request_id
             }
         )
 
@@ -254,34 +333,41 @@ def handle_validation_exception(request: Request, exc: ValidationError) -> JSONR
     Returns:
         JSONResponse with validation errors
     """
-    from .core.config import settings
-
     request_id = getattr(request.state, "request_id", "unknown")
 
     # In production, simplify validation errors
-    if settings.app_env == "prod":
+    if _IS_PROD:
         return JSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content={
-                "detail": ERROR_MESSAGES["validation_error"],
+                "detail": _MSG_VALIDATION,
                 "request_id": request_id
             }
         )
 
-    # In development, show detailed validation errors
-    errors = exc.errors()
-    formatted_errors = []
-    for error in errors:
-        formatted_errors.append({
-            "field": " -> ".join(str(loc) for loc in error["loc"]),
+    # In development, show detailed validation errors. For pydantic
+    # errors, skipping the doc URL and input context makes errors()
+    # noticeably cheaper (FastAPI's RequestValidationError.errors()
+    # takes no arguments); the locally bound join avoids a method
+    # lookup per error.
+    if isinstance(exc, ValidationError):
+        errors = exc.errors(include_url=False, include_context=False)
+    else:
+        errors = exc.errors()
+    sj = " -> ".join
+    formatted_errors = [
+        {
+            "field": sj(map(str, error["loc"])),
             "message": error["msg"],
-            "type": error["type"]
-        })
+            "type": error["type"],
+        }
+        for error in errors
+    ]
 
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
-            "detail": ERROR_MESSAGES["validation_error"],
+            "detail": _MSG_VALIDATION,
             "errors": formatted_errors,
             "request_id": request_id
         }
@@ -301,7 +387,9 @@ def handle_generic_exception(request: Request, exc: Exception) -> JSONResponse:
     """
     # Log the full error
     logger.exception(
-        f"Unhandled exception in {request.method} {request.url.path}",
+        "Unhandled exception in %s %s",
+        request.method,
+        request.url.path,
         extra={
             "request_id": getattr(request.state, "request_id", "unknown")
         }
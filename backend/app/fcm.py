@@ -5,7 +5,8 @@ using Firebase Cloud Messaging. Notifications are sent to users based on
 various events like new matches, messages, etc.
 """
 
-from typing import Optional
+import logging
+from typing import List, Optional, Union
 from pathlib import Path
 
 import firebase_admin
@@ -13,15 +14,32 @@ from firebase_admin import credentials, messaging
 from sqlalchemy.orm import Session
 
 from .models import User
+from .i18n import DEFAULT_LANGUAGE, translate
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Stdlib view of the same logger for cheap level checks; the structlog
+# filtering wrapper has no isEnabledFor
+_stdlib_logger = logging.getLogger(__name__)
+
 # Initialize Firebase Admin SDK
 # The service account key should be placed at backend/firebase-service-account.json
 # You can download it from Firebase Console > Project Settings > Service Accounts
 _firebase_initialized = False
 
+# Android delivery options never vary per notification; firebase-admin
+# message objects are plain immutable containers, so one shared instance
+# avoids rebuilding four objects per send.
+_ANDROID_CFG = messaging.AndroidConfig(
+    priority="high",
+    notification=messaging.AndroidNotification(
+        icon="ic_notification",
+        color="#FF6B6B",
+        channel_id="regami_notifications",
+    ),
+)
+
 
 def initialize_firebase():
     """Initialize Firebase Admin SDK with service account credentials.
@@ -77,8 +95,12 @@ def send_fcm_notification(
         logger.warning("firebase_not_initialized", action="skipping_notification")
         return False
 
-    if not user.fcm_token:
-        logger.debug("user_has_no_fcm_token", user_id=user.id, action="skipping_notification")
+    # Read the instrumented attribute once; high-fanout loops mostly hit
+    # users without a token, so keep this path allocation-free (the debug
+    # kwargs dict is only built when debug logging is on)
+    if not (token := user.fcm_token):
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("user_has_no_fcm_token", user_id=user.id, action="skipping_notification")
         return False
 
     try:
@@ -88,24 +110,18 @@ def send_fcm_notification(
                 body=body,
             ),
             data=data or {},
-            token=user.fcm_token,
-            android=messaging.AndroidConfig(
-                priority="high",
-                notification=messaging.AndroidNotification(
-                    icon="ic_notification",
-                    color="#FF6B6B",
-                    channel_id="regami_notifications",
-                ),
-            ),
+            token=token,
+            android=_ANDROID_CFG,
         )
 
         response = messaging.send(message)
-        logger.info(
-            "fcm_notification_sent",
-            user_id=user.id,
-            title=title,
-            response=response
-        )
+        if _stdlib_logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "fcm_notification_sent",
+                user_id=user.id,
+                title=title,
+                response=response
+            )
         return True
 
     except messaging.UnregisteredError:
@@ -128,48 +144,137 @@ def send_fcm_notification(
         return False
 
 
-def notify_new_match(db: Session, user_id: str, match_id: str, dog_name: str):
+def send_fcm_batch(
+    users: List[User],
+    title: str,
+    body: str,
+    data: Optional[dict] = None,
+) -> int:
+    """Send the same push notification to several users in one FCM call.
+
+    Uses send_each_for_multicast (up to 500 tokens per request), so a
+    fan-out costs one HTTP round-trip instead of one per recipient.
+
+    Args:
+        users: Recipients; users without an fcm_token are skipped
+        title: Notification title
+        body: Notification body text
+        data: Optional dictionary of custom data to include
+
+    Returns:
+        Number of notifications delivered successfully
+    """
+    if not _firebase_initialized:
+        logger.warning("firebase_not_initialized", action="skipping_notification")
+        return 0
+
+    recipients = [u for u in users if u.fcm_token]
+    if not recipients:
+        return 0
+
+    try:
+        message = messaging.MulticastMessage(
+            tokens=[u.fcm_token for u in recipients],
+            notification=messaging.Notification(
+                title=title,
+                body=body,
+            ),
+            data=data or {},
+            android=_ANDROID_CFG,
+        )
+        batch_response = messaging.send_each_for_multicast(message)
+    except Exception as e:
+        logger.error(
+            "fcm_batch_failed",
+            user_count=len(recipients),
+            title=title,
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        return 0
+
+    # One pass over the responses to surface dead tokens
+    for user, response in zip(recipients, batch_response.responses):
+        if not response.success and isinstance(
+            response.exception, messaging.UnregisteredError
+        ):
+            logger.warning(
+                "fcm_token_invalid",
+                user_id=user.id,
+                action="token_should_be_cleared",
+            )
+
+    if _stdlib_logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "fcm_batch_sent",
+            success_count=batch_response.success_count,
+            failure_count=batch_response.failure_count,
+            title=title,
+        )
+    return batch_response.success_count
+
+
+def _resolve_user(db: Session, user: Union[User, str]) -> Optional[User]:
+    """Accept a pre-fetched User or an id, hitting the DB only for ids.
+
+    Endpoints that notify several parties usually already hold the User
+    rows (e.g. via match.offer.user); passing them through skips a
+    redundant db.get per notification.
+    """
+    if isinstance(user, User):
+        return user
+    return db.get(User, user)
+
+
+def notify_new_match(db: Session, user_id: Union[User, str, List[str]], match_id: str, dog_name: str):
     """Send notification when a new match is created.
 
     Args:
         db: Database session
-        user_id: ID of the user to notify
+        user_id: The user to notify (User row or id), or a list of
+            ids to fan out to in a single batched FCM call
         match_id: ID of the match that was created
         dog_name: Name of the matched dog
     """
-    user = db.get(User, user_id)
+    data = {
+        "type": "new_match",
+        "match_id": match_id,
+        "deep_link": "/availability",
+    }
+    # Users have no stored language preference yet, so templates resolve
+    # in the default language; the lookups hit the i18n cache.
+    title = translate("push_new_match_title", DEFAULT_LANGUAGE)
+    body = translate("push_new_match_body", DEFAULT_LANGUAGE, dog_name=dog_name)
+
+    if isinstance(user_id, list):
+        users = db.query(User).filter(User.id.in_(user_id)).all()
+        send_fcm_batch(users, title=title, body=body, data=data)
+        return
+
+    user = _resolve_user(db, user_id)
     if not user:
         return
 
-    send_fcm_notification(
-        user=user,
-        title="Nouveau match ! 🎉",
-        body=f"Vous avez un nouveau match avec {dog_name} !",
-        data={
-            "type": "new_match",
-            "match_id": match_id,
-            "deep_link": "/availability",
-        },
-    )
+    send_fcm_notification(user=user, title=title, body=body, data=data)
 
 
-def notify_match_accepted(db: Session, user_id: str, match_id: str, dog_name: str):
+def notify_match_accepted(db: Session, user_id: Union[User, str], match_id: str, dog_name: str):
     """Send notification when a match is accepted.
 
     Args:
         db: Database session
-        user_id: ID of the user to notify
+        user_id: The user to notify (User row or id)
         match_id: ID of the match that was accepted
         dog_name: Name of the dog whose owner accepted
     """
-    user = db.get(User, user_id)
+    user = _resolve_user(db, user_id)
     if not user:
         return
 
     send_fcm_notification(
         user=user,
-        title="Match accepté ! 💚",
-        body=f"{dog_name} a accepté votre match !",
+        title=translate("push_match_accepted_title", DEFAULT_LANGUAGE),
+        body=translate("push_match_accepted_body", DEFAULT_LANGUAGE, dog_name=dog_name),
         data={
             "type": "match_accepted",
             "match_id": match_id,
@@ -178,23 +283,23 @@ def notify_match_accepted(db: Session, user_id: str, match_id: str, dog_name: st
     )
 
 
-def notify_match_confirmed(db: Session, user_id: str, match_id: str, dog_name: str):
+def notify_match_confirmed(db: Session, user_id: Union[User, str], match_id: str, dog_name: str):
     """Send notification when a match is confirmed by both parties.
 
     Args:
         db: Database session
-        user_id: ID of the user to notify
+        user_id: The user to notify (User row or id)
         match_id: ID of the match that was confirmed
         dog_name: Name of the matched dog
     """
-    user = db.get(User, user_id)
+    user = _resolve_user(db, user_id)
     if not user:
         return
 
     send_fcm_notification(
         user=user,
-        title="Match confirmé ! 🎊",
-        body=f"Votre rendez-vous avec {dog_name} est confirmé ! Vous pouvez maintenant échanger des messages.",
+        title=translate("push_match_confirmed_title", DEFAULT_LANGUAGE),
+        body=translate("push_match_confirmed_body", DEFAULT_LANGUAGE, dog_name=dog_name),
         data={
             "type": "match_confirmed",
             "match_id": match_id,
@@ -203,22 +308,22 @@ def notify_match_confirmed(db: Session, user_id: str, match_id: str, dog_name: s
     )
 
 
-def notify_match_rejected(db: Session, user_id: str, match_id: str):
+def notify_match_rejected(db: Session, user_id: Union[User, str], match_id: str):
     """Send notification when a match is rejected.
 
     Args:
         db: Database session
-        user_id: ID of the user to notify
+        user_id: The user to notify (User row or id)
         match_id: ID of the match that was rejected
     """
-    user = db.get(User, user_id)
+    user = _resolve_user(db, user_id)
     if not user:
         return
 
     send_fcm_notification(
         user=user,
-        title="Match refusé",
-        body="Un de vos matchs a été refusé.",
+        title=translate("push_match_rejected_title", DEFAULT_LANGUAGE),
+        body=translate("push_match_rejected_body", DEFAULT_LANGUAGE),
         data={
             "type": "match_rejected",
             "match_id": match_id,
@@ -227,16 +332,16 @@ def notify_match_rejected(db: Session, user_id: str, match_id: str):
     )
 
 
-def notify_new_message(db: Session, user_id: str, sender_name: str, message_preview: str):
+def notify_new_message(db: Session, user_id: Union[User, str], sender_name: str, message_preview: str):
     """Send notification when a new message is received.
 
     Args:
         db: Database session
-        user_id: ID of the user to notify (recipient)
+        user_id: The user to notify (User row or id of the recipient)
         sender_name: Name of the user who sent the message
         message_preview: Preview of the message content (truncated if needed)
     """
-    user = db.get(User, user_id)
+    user = _resolve_user(db, user_id)
     if not user:
         return
 
@@ -246,11 +351,11 @@ def notify_new_message(db: Session, user_id: str, sender_name: str, message_prev
 
     send_fcm_notification(
         user=user,
-        title=f"Nouveau message de {sender_name}",
+        title=translate("push_new_message_title", DEFAULT_LANGUAGE, sender=sender_name),
         body=message_preview,
         data={
             "type": "new_message",
-            "sender_id": user_id,
+            "sender_id": user.id,
             "deep_link": "/messages",
         },
     )
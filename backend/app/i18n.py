@@ -2,9 +2,12 @@
 Internationalization support for the Regami API.
 Detects language from Accept-Language header and provides localized messages.
 """
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, Optional
 from fastapi import Request
 import re
+import sys
 
 
 # Translation dictionaries
@@ -56,6 +59,17 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "email_match_subject": "New match for {dog_name}",
         "email_offer_subject": "Offer status update",
 
+        # Push notification templates
+        "push_new_match_title": "New match! 🎉",
+        "push_new_match_body": "You have a new match with {dog_name}!",
+        "push_match_accepted_title": "Match accepted! 💚",
+        "push_match_accepted_body": "{dog_name} accepted your match!",
+        "push_match_confirmed_title": "Match confirmed! 🎊",
+        "push_match_confirmed_body": "Your meetup with {dog_name} is confirmed! You can now exchange messages.",
+        "push_match_rejected_title": "Match declined",
+        "push_match_rejected_body": "One of your matches was declined.",
+        "push_new_message_title": "New message from {sender}",
+
         # General
         "server_error": "An error occurred. Please try again later",
         "not_found": "Resource not found",
@@ -108,6 +122,17 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "email_match_subject": "Nouveau match pour {dog_name}",
         "email_offer_subject": "Mise à jour du statut de l'offre",
 
+        # Push notification templates
+        "push_new_match_title": "Nouveau match ! 🎉",
+        "push_new_match_body": "Vous avez un nouveau match avec {dog_name} !",
+        "push_match_accepted_title": "Match accepté ! 💚",
+        "push_match_accepted_body": "{dog_name} a accepté votre match !",
+        "push_match_confirmed_title": "Match confirmé ! 🎊",
+        "push_match_confirmed_body": "Votre rendez-vous avec {dog_name} est confirmé ! Vous pouvez maintenant échanger des messages.",
+        "push_match_rejected_title": "Match refusé",
+        "push_match_rejected_body": "Un de vos matchs a été refusé.",
+        "push_new_message_title": "Nouveau message de {sender}",
+
         # General
         "server_error": "Une erreur est survenue. Veuillez réessayer plus tard",
         "not_found": "Ressource introuvable",
@@ -115,43 +140,65 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
     }
 }
 
+# Intern language codes and message keys once at import: lookups from
+# literal keys (which CPython interns) then hit the pointer-equality
+# fast path in the dict probe instead of full string comparison.
+TRANSLATIONS = {
+    sys.intern(lang): {sys.intern(key): value for key, value in table.items()}
+    for lang, table in TRANSLATIONS.items()
+}
+
 DEFAULT_LANGUAGE = "fr"  # French is primary language
 
+# Supported base language codes; frozenset membership beats probing the
+# (large) TRANSLATIONS dict for every candidate
+SUPPORTED = frozenset(TRANSLATIONS)
+
+# Flattened views built once at import: one hash probe per lookup
+# instead of two, and no per-call fallback dict access. TRANSLATIONS
+# itself stays public for anything iterating per-language tables.
+_FLAT: Dict[tuple, str] = {
+    (lang, key): value
+    for lang, table in TRANSLATIONS.items()
+    for key, value in table.items()
+}
+_DEFAULT_FLAT: Dict[str, str] = dict(TRANSLATIONS[DEFAULT_LANGUAGE])
+
+# Matches one language spec with optional quality score: "fr-FR;q=0.9".
+# The quality pattern only admits well-formed decimals, so float() on a
+# match can't fail.
+_LANG_RE = re.compile(r"([A-Za-z-]+)(?:;q=([0-9]+(?:\.[0-9]+)?))?")
 
+
+@lru_cache(maxsize=512)
 def parse_accept_language(accept_language: Optional[str]) -> str:
     """
     Parse Accept-Language header and return best matching language code.
 
     Format: Accept-Language: fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7
     Returns: 'fr' or 'en' (defaults to 'fr' if no match)
+
+    Cached: clients send a handful of distinct headers, so after warmup
+    per-request detection is a single dict lookup.
     """
     if not accept_language:
         return DEFAULT_LANGUAGE
 
-    # Parse language preferences with quality scores
-    languages = []
-    for lang_spec in accept_language.split(','):
-        lang_spec = lang_spec.strip()
-        if ';q=' in lang_spec:
-            lang, quality = lang_spec.split(';q=')
-            try:
-                quality_score = float(quality)
-            except ValueError:
-                quality_score = 1.0
-        else:
-            lang = lang_spec
-            quality_score = 1.0
-
-        # Extract base language code (fr-FR -> fr)
-        base_lang = lang.split('-')[0].lower()
-        languages.append((base_lang, quality_score))
+    # Parse language preferences with quality scores in one regex pass;
+    # base language code is extracted inline (fr-FR -> fr)
+    languages = [
+        (lang.split('-', 1)[0].lower(), float(quality) if quality else 1.0)
+        for lang, quality in _LANG_RE.findall(accept_language)
+    ]
 
-    # Sort by quality score (descending)
-    languages.sort(key=lambda x: x[1], reverse=True)
+    # Sort by quality score (descending); single-token headers (the
+    # common case) skip the sort, and itemgetter beats a lambda key
+    if len(languages) > 1:
+        languages.sort(key=itemgetter(1), reverse=True)
 
     # Find first supported language
     for lang_code, _ in languages:
-        if lang_code in TRANSLATIONS:
+        if lang_code in SUPPORTED:
             return lang_code
 
     return DEFAULT_LANGUAGE
@@ -160,7 +207,22 @@ def parse_accept_language(accept_language: Optional[str]) -> str:
 def get_language_from_request(request: Request) -> str:
     """Extract language preference from request headers."""
     accept_language = request.headers.get("Accept-Language")
-    return parse_accept_language(accept_language)
+    if not accept_language:
+        # Missing header is the common case; skip the call frame
+        return DEFAULT_LANGUAGE
+    # casefold collapses "fr-FR" / "fr-fr" variants into one cache entry
+    return parse_accept_language(accept_language.casefold())
+
+
+@lru_cache(maxsize=1024)
+def _lookup(key: str, language: str) -> str:
+    """Resolve a translation key (no formatting); memoized since the
+    key/language space is small and fixed."""
+    message = _FLAT.get((language, key))
+    if message is not None:
+        return message
+    # Unknown language falls back to the default table, then to the key
+    return _DEFAULT_FLAT.get(key, key)
 
 
 def translate(key: str, language: str = DEFAULT_LANGUAGE, **kwargs) -> str:
@@ -175,10 +237,10 @@ def translate(key: str, language: str = DEFAULT_LANGUAGE, **kwargs) -> str:
     Returns:
         Translated and formatted message
     """
-    lang_dict = TRANSLATIONS.get(language, TRANSLATIONS[DEFAULT_LANGUAGE])
-    message = lang_dict.get(key, key)  # Fallback to key if translation missing
+    message = _lookup(key, language)
 
-    # Format message with provided parameters
+    # Format message with provided parameters; parameterless keys (the
+    # common case) skip the try frame entirely
     if kwargs:
         try:
             message = message.format(**kwargs)
@@ -197,9 +259,20 @@ def get_translator(request: Request):
         def example(t: Callable = Depends(get_translator)):
             return {"message": t("success_message")}
     """
-    language = get_language_from_request(request)
+    # Bind the language table once per request; each t() call is then a
+    # single dict.get, with formatting (and its guard) only on keys
+    # that actually take parameters.
+    lang_dict = TRANSLATIONS.get(
+        get_language_from_request(request), TRANSLATIONS[DEFAULT_LANGUAGE]
+    )
 
     def t(key: str, **kwargs) -> str:
-        return translate(key, language, **kwargs)
+        message = lang_dict.get(key, key)
+        if kwargs:
+            try:
+                return message.format(**kwargs)
+            except (KeyError, ValueError):
+                pass  # Return unformatted message if formatting fails
+        return message
 
     return t
@@ -4,23 +4,110 @@ This module sets up structured logging with JSON output, request ID tracking,
 user context, and sensitive data redaction.
 """
 
+import atexit
 import logging
 import logging.config
+import os
+import queue
+import re
+import socket
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
+import orjson
 import structlog
 from structlog.types import EventDict, Processor
 
 from .core.config import settings
 
+# Background listener that performs the actual log I/O; request threads
+# only enqueue records (see configure_logging)
+_queue_listener: QueueListener | None = None
+
+
+def _stop_queue_listener() -> None:
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
+# Static per-process context, resolved once at import: the processor
+# fires on every log event and none of these values change at runtime
+_STATIC_CTX = {
+    "app": "regami",
+    "environment": settings.app_env,
+    "hostname": socket.gethostname(),
+    "pid": os.getpid(),
+}
+
 
 def add_app_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """Add application context to log entries."""
-    event_dict["app"] = "regami"
-    event_dict["environment"] = settings.app_env
+    event_dict.update(_STATIC_CTX)
     return event_dict
 
 
+# Per-request context set by RequestIDMiddleware. A single ContextVar
+# holding a prebuilt dict is cheaper than structlog's
+# clear_contextvars/bind_contextvars pair, which walk the contextvars
+# machinery per bound key on every request.
+_request_ctx: ContextVar[dict] = ContextVar("regami_request_ctx", default={})
+
+
+def set_request_context(ctx: dict) -> Token:
+    """Bind per-request log context; returns a token for reset."""
+    return _request_ctx.set(ctx)
+
+
+def reset_request_context(token: Token) -> None:
+    """Restore the previous request context."""
+    _request_ctx.reset(token)
+
+
+def inject_request_context(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+    """Merge the current request context into the event."""
+    ctx = _request_ctx.get()
+    if ctx:
+        event_dict.update(ctx)
+    return event_dict
+
+
+# Key names (and substrings of key names) whose values must never be
+# logged. The processor runs on every log line, so the match machinery
+# is built once here: exact membership is a frozenset probe, and the
+# substring fallback is one pass of a precompiled alternation instead
+# of eleven Python `in` scans per key.
+_SENSITIVE_KEYS = frozenset({
+    "password",
+    "pwd",
+    "token",
+    "access_token",
+    "refresh_token",
+    "authorization",
+    "api_key",
+    "apikey",
+    "secret",
+    "private_key",
+    "fcm_token",
+})
+_SENSITIVE_RE = re.compile("|".join(map(re.escape, sorted(_SENSITIVE_KEYS))))
+
+
+@lru_cache(maxsize=2048)
+def _is_sensitive(key_lower: str) -> bool:
+    # Log payloads draw keys from a small fixed vocabulary (model
+    # fields, header names), so after warmup the per-key cost is one
+    # C-level cache probe and the multi-pattern scan never reruns.
+    return key_lower in _SENSITIVE_KEYS or _SENSITIVE_RE.search(key_lower) is not None
+
+
 def censor_sensitive_data(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
     """Redact sensitive data from log entries.
 
@@ -30,62 +117,75 @@ def censor_sensitive_data(logger: Any, method_name: str, event_dict: EventDict)
     - authorization headers
     - api_key fields
     """
-    sensitive_keys = {
-        "password",
-        "pwd",
-        "token",
-        "access_token",
-        "refresh_token",
-        "authorization",
-        "api_key",
-        "apikey",
-        "secret",
-        "private_key",
-        "fcm_token",
-    }
-
-    for key in list(event_dict.keys()):
-        key_lower = key.lower()
-        # Check if key matches sensitive patterns
-        if any(sensitive in key_lower for sensitive in sensitive_keys):
-            event_dict[key] = "***REDACTED***"
-
-        # Also check nested dictionaries and lists
-        elif isinstance(event_dict[key], dict):
-            event_dict[key] = _censor_dict(event_dict[key], sensitive_keys)
-        elif isinstance(event_dict[key], list):
-            event_dict[key] = _censor_list(event_dict[key], sensitive_keys)
-
+    _censor_inplace(event_dict)
     return event_dict
 
 
-def _censor_dict(data: dict, sensitive_keys: set) -> dict:
-    """Recursively censor sensitive keys in nested dictionaries."""
-    censored = {}
-    for key, value in data.items():
-        key_lower = key.lower()
-        if any(sensitive in key_lower for sensitive in sensitive_keys):
-            censored[key] = "***REDACTED***"
-        elif isinstance(value, dict):
-            censored[key] = _censor_dict(value, sensitive_keys)
-        elif isinstance(value, list):
-            censored[key] = _censor_list(value, sensitive_keys)
-        else:
-            censored[key] = value
-    return censored
-
-
-def _censor_list(data: list, sensitive_keys: set) -> list:
-    """Recursively censor sensitive keys in lists."""
-    censored = []
-    for item in data:
-        if isinstance(item, dict):
-            censored.append(_censor_dict(item, sensitive_keys))
-        elif isinstance(item, list):
-            censored.append(_censor_list(item, sensitive_keys))
-        else:
-            censored.append(item)
-    return censored
+_REDACTED = "***REDACTED***"
+
+# key -> key.lower(), capped. Log keys come from a small fixed
+# vocabulary (model fields, header names), so after warmup the lower()
+# allocation per visited key disappears; the cap just bounds growth if
+# something logs unbounded key sets.
+_LOWER_CACHE: dict = {}
+_LOWER_CACHE_MAX = 1024
+
+
+def _censor_inplace(root: dict) -> None:
+    """Walk nested dicts/lists iteratively, redacting sensitive keys.
+
+    Mutates containers in place with an explicit stack: no per-level
+    Python frame and no rebuilt dict/list copies, which matters because
+    this runs on the processor chain of every log line. Globals used in
+    the loop are rebound as locals so the hot path pays LOAD_FAST
+    instead of dict lookups per key.
+    """
+    stack = [root]
+    pop = stack.pop
+    push = stack.append
+    is_sensitive = _is_sensitive
+    redacted = _REDACTED
+    lower_cache = _LOWER_CACHE
+    while stack:
+        node = pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                key_lower = lower_cache.get(key)
+                if key_lower is None:
+                    key_lower = key.lower()
+                    if len(lower_cache) < _LOWER_CACHE_MAX:
+                        lower_cache[key] = key_lower
+                if is_sensitive(key_lower):
+                    node[key] = redacted
+                elif isinstance(value, (dict, list)):
+                    push(value)
+        else:  # list
+            for item in node:
+                if isinstance(item, (dict, list)):
+                    push(item)
+
+
+class _ForeignJsonFormatter(logging.Formatter):
+    """JSON lines for stdlib records that never pass through structlog.
+
+    In prod the app's own events go straight to stdout via
+    BytesLoggerFactory, so the only records reaching the stdlib handler
+    are third-party ones (uvicorn, sqlalchemy, botocore). Render them
+    with the same field names the structlog chain emits, keeping the
+    output stream pure JSON lines.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "event": record.getMessage(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            **_STATIC_CTX,
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
 
 
 def configure_logging() -> None:
@@ -106,16 +206,24 @@ def configure_logging() -> None:
         "version": 1,
         "disable_existing_loggers": False,
         "formatters": {
-            "json": {
-                "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
-                "format": "%(asctime)s %(name)s %(levelname)s %(message)s",
+            # Dev pass-through: structlog events arrive fully rendered
+            # (timestamp, level and context already in the message), so
+            # running JsonFormatter on them JSON-encoded every record a
+            # second time for nothing.
+            "plain": {
+                "format": "%(message)s",
+            },
+            # Prod: only foreign (third-party) records reach stdlib, so
+            # wrap them in the chain's JSON shape
+            "foreign_json": {
+                "()": _ForeignJsonFormatter,
             },
         },
         "handlers": {
             "console": {
                 "class": "logging.StreamHandler",
                 "level": log_level,
-                "formatter": "json",
+                "formatter": "plain" if settings.app_env == "dev" else "foreign_json",
                 "stream": "ext://sys.stdout",
             },
         },
@@ -133,38 +241,79 @@ def configure_logging() -> None:
         },
     })
 
-    # Build processor chain
+    # Swap the root handlers for a QueueHandler so emitting a record is
+    # just an enqueue; a single background thread does the formatting
+    # and stream writes. Keeps blocking I/O (and log-rotation stalls)
+    # off request threads, and a 5xx burst no longer serializes on
+    # stderr writes.
+    _stop_queue_listener()
+    global _queue_listener
+    root_logger = logging.getLogger()
+    sync_handlers = root_logger.handlers[:]
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.handlers = [QueueHandler(log_queue)]
+    _queue_listener = QueueListener(
+        log_queue, *sync_handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+    # Shared processor chain (level filtering happens in the wrapper
+    # class below, before the chain is entered at all)
     processors: list[Processor] = [
         structlog.contextvars.merge_contextvars,
+        inject_request_context,
         add_app_context,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.add_logger_name,
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso", utc=True),
-        structlog.processors.StackInfoRenderer(),
         censor_sensitive_data,
     ]
 
-    # Add appropriate final processor based on environment
+    # StackInfoRenderer inspects every event for stack_info; nothing in
+    # the app passes it, so only pay for the processor when explicitly
+    # enabled
+    if settings.enable_stack_info:
+        processors.insert(-1, structlog.processors.StackInfoRenderer())
+
     if settings.app_env == "dev":
-        # Pretty console output for development
+        # Pretty console output for development, routed through stdlib
+        # so dev logs interleave with third-party loggers
+        processors.insert(0, structlog.stdlib.filter_by_level)
+        processors.insert(-1, structlog.stdlib.add_logger_name)
         processors.append(structlog.dev.ConsoleRenderer())
+        logger_factory: Any = structlog.stdlib.LoggerFactory()
     else:
-        # JSON output for production (log aggregation)
+        # Production bypasses stdlib entirely for app events: orjson
+        # renders straight to bytes and BytesLogger writes them to
+        # stdout's buffer in one call, skipping LogRecord creation,
+        # handler dispatch and str round-trips. Third-party stdlib
+        # loggers still flow through the queue configured above.
         processors.extend([
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(
+                serializer=lambda obj, **kw: orjson.dumps(obj, default=str)
+            ),
         ])
+        logger_factory = structlog.BytesLoggerFactory()
 
-    # Configure structlog
+    # Configure structlog. The filtering wrapper turns sub-threshold
+    # log calls into a single level comparison that returns before the
+    # processor chain is even entered.
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
 
+# Logger instances by name. structlog's cache_logger_on_first_use
+# memoizes the bound logger per proxy, but every get_logger call still
+# built a new lazy proxy; helpers that fetch loggers repeatedly now hit
+# one dict probe instead.
+_LOGGER_CACHE: dict = {}
+
+
 def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
     """Get a structured logger instance.
 
@@ -179,4 +328,7 @@ def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
         >>> logger = get_logger(__name__)
         >>> logger.info("user_registered", user_id="123", email="user@example.com")
     """
-    return structlog.get_logger(name)
+    logger = _LOGGER_CACHE.get(name)
+    if logger is None:
+        logger = _LOGGER_CACHE[name] = structlog.get_logger(name)
+    return logger
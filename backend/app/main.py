@@ -9,16 +9,13 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from .core.config import settings, validate_production_config
 from .rate_limit import limiter
-from .middleware import HTTPSRedirectMiddleware, RequestIDMiddleware
+from .middleware import HTTPSRedirectMiddleware, LegacyPathRewriteMiddleware, RequestIDMiddleware
 from .csrf import CSRFMiddleware
 from .error_handler import handle_http_exception, handle_validation_exception, handle_generic_exception
 
 from .db import Base, engine, get_db
 from .routers import auth, users, availability, notifications, dogs, websocket, messages
-from .fcm import initialize_firebase
 from .logging_config import configure_logging, get_logger
-from .sentry_config import init_sentry
-from prometheus_fastapi_instrumentator import Instrumentator
 import signal
 import sys
 
@@ -27,8 +24,59 @@ import sys
 configure_logging()
 logger = get_logger(__name__)
 
-# Initialize Sentry for error tracking
-init_sentry()
+# Router registration table, built once at import. create_app runs per
+# test and per Lambda cold start; a static tuple keeps that to a loop
+# over prebuilt specs: (router, prefix, tags, deprecated). CORS origins
+# are likewise parsed once, on settings (cors_origins_list).
+_ROUTER_SPECS = (
+	# v1 API
+	(auth.router, "/v1/auth", ["v1", "auth"], False),
+	(users.router, "/v1/users", ["v1", "users"], False),
+	(availability.router, "/v1/availability", ["v1", "availability"], False),
+	(notifications.router, "/v1/notifications", ["v1", "notifications"], False),
+	(dogs.router, "/v1/dogs", ["v1", "dogs"], False),
+	(messages.router, "/v1/messages", ["v1", "messages"], False),
+	(websocket.router, "/v1", ["v1", "websocket"], False),
+)
+
+# Initialize Sentry for error tracking. The SDK (and its integrations)
+# is only imported when a DSN is configured: the import chain costs
+# real cold-start time on Lambda and does nothing without a DSN.
+if settings.sentry_dsn:
+	from .sentry_config import init_sentry
+
+	init_sentry()
+
+
+# Graceful shutdown handling (for Lambda and container interruptions).
+# Registered once at import rather than in create_app: tests build an
+# app per test, and each registration is a syscall plus a fresh closure.
+def handle_shutdown(sig, frame):
+	"""Graceful shutdown handler for SIGTERM/SIGINT.
+
+	Called when:
+	- Lambda is being shut down
+	- ECS/Fargate task is stopping
+	- Spot instance is being interrupted
+	"""
+	logger.info("shutdown_initiated", signal=sig)
+	try:
+		# Close database connections
+		engine.dispose()
+		logger.info("database_connections_closed")
+	except Exception as e:
+		logger.error("shutdown_error", error=str(e))
+	sys.exit(0)
+
+
+# Register shutdown handlers (not needed for Lambda, but safe to
+# register); signal.signal only works from the main thread, so tolerate
+# imports from elsewhere
+try:
+	signal.signal(signal.SIGTERM, handle_shutdown)
+	signal.signal(signal.SIGINT, handle_shutdown)
+except ValueError:
+	pass
 
 
 def create_app() -> FastAPI:
@@ -38,8 +86,12 @@ def create_app() -> FastAPI:
 
 	logger.info("application_starting", environment=settings.app_env)
 
-	# Initialize Firebase for push notifications
-	initialize_firebase()
+	# Initialize Firebase for push notifications (import deferred:
+	# firebase-admin pulls in the google-api stack)
+	if settings.fcm_enabled:
+		from .fcm import initialize_firebase
+
+		initialize_firebase()
 
 	app = FastAPI(
 		title="Regami API",
@@ -108,7 +160,11 @@ Accept-Language: fr-FR,fr;q=0.9,en;q=0.8
 		},
 	)
 
-	# Add rate limiter
+	# Add rate limiter. SlowAPIMiddleware is deliberately NOT used: it
+	# exempts every route that carries a @limiter.limit decorator, so
+	# with no default_limits it would enforce nothing. Early rejection
+	# (429 before a DB connection is acquired) is instead done by the
+	# get_db_rate_limited dependency on the auth routes.
 	app.state.limiter = limiter
 	app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore[arg-type]
 
@@ -118,15 +174,17 @@ Accept-Language: fr-FR,fr;q=0.9,en;q=0.8
 	app.add_exception_handler(Exception, handle_generic_exception)  # type: ignore[arg-type]
 
 	# CORS for local web dev (Vite default port 5173)
-	origins = [o.strip() for o in settings.cors_origins.split(',') if o.strip()]
 	app.add_middleware(
 		CORSMiddleware,
-		allow_origins=origins,
+		allow_origins=settings.cors_origins_list,
 		allow_credentials=True,
 		allow_methods=["*"],
 		allow_headers=["*"],
 	)
 
+	# Map legacy unversioned paths onto /v1 before routing
+	app.add_middleware(LegacyPathRewriteMiddleware)
+
 	# Request ID tracing for all requests
 	app.add_middleware(RequestIDMiddleware)
 
@@ -168,49 +226,21 @@ Accept-Language: fr-FR,fr;q=0.9,en;q=0.8
 		uploads_mount = settings.storage_local_dir
 		app.mount("/static/uploads", StaticFiles(directory=uploads_mount), name="uploads")
 
-	# Routers - v1 API
-	app.include_router(auth.router, prefix="/v1/auth", tags=["v1", "auth"])
-	app.include_router(users.router, prefix="/v1/users", tags=["v1", "users"])
-	app.include_router(availability.router, prefix="/v1/availability", tags=["v1", "availability"])
-	app.include_router(notifications.router, prefix="/v1/notifications", tags=["v1", "notifications"])
-	app.include_router(dogs.router, prefix="/v1/dogs", tags=["v1", "dogs"])
-	app.include_router(messages.router, prefix="/v1/messages", tags=["v1", "messages"])
-	app.include_router(websocket.router, prefix="/v1", tags=["v1", "websocket"])
-
-	# Legacy routes (without /v1 prefix) - redirect to v1 for backward compatibility
-	app.include_router(auth.router, prefix="/auth", tags=["legacy", "auth"], deprecated=True)
-	app.include_router(users.router, prefix="/users", tags=["legacy", "users"], deprecated=True)
-	app.include_router(availability.router, prefix="/availability", tags=["legacy", "availability"], deprecated=True)
-	app.include_router(notifications.router, prefix="/notifications", tags=["legacy", "notifications"], deprecated=True)
-	app.include_router(dogs.router, prefix="/dogs", tags=["legacy", "dogs"], deprecated=True)
-	app.include_router(messages.router, prefix="/messages", tags=["legacy", "messages"], deprecated=True)
-	app.include_router(websocket.router, tags=["legacy", "websocket"], deprecated=True)
-
-	# Prometheus metrics instrumentation
-	Instrumentator().instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
-	logger.info("prometheus_metrics_enabled", endpoint="/metrics")
-
-	# Graceful shutdown handler (for Lambda and container interruptions)
-	def handle_shutdown(sig, frame):
-		"""Graceful shutdown handler for SIGTERM/SIGINT.
-
-		Called when:
-		- Lambda is being shut down
-		- ECS/Fargate task is stopping
-		- Spot instance is being interrupted
-		"""
-		logger.info("shutdown_initiated", signal=sig)
-		try:
-			# Close database connections
-			engine.dispose()
-			logger.info("database_connections_closed")
-		except Exception as e:
-			logger.error("shutdown_error", error=str(e))
-		sys.exit(0)
-
-	# Register shutdown handlers (not needed for Lambda, but safe to register)
-	signal.signal(signal.SIGTERM, handle_shutdown)
-	signal.signal(signal.SIGINT, handle_shutdown)
+	# Routers - v1 API, from the module-level registration table. Legacy
+	# unversioned paths are rewritten onto /v1 by
+	# LegacyPathRewriteMiddleware instead of registering every router
+	# twice, which kept the route table (a linear scan per request) at
+	# half the size.
+	for router, prefix, tags, deprecated in _ROUTER_SPECS:
+		app.include_router(router, prefix=prefix, tags=tags, deprecated=deprecated)
+
+	# Prometheus metrics instrumentation (import deferred, skipped
+	# entirely when metrics are disabled)
+	if settings.enable_metrics:
+		from prometheus_fastapi_instrumentator import Instrumentator
+
+		Instrumentator().instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
+		logger.info("prometheus_metrics_enabled", endpoint="/metrics")
 
 	return app
 
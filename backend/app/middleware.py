@@ -1,65 +1,97 @@
-"""Custom middleware for the Regami API."""
+"""Custom middleware for the Regami API.
 
-import uuid
-from typing import Callable
+These are pure ASGI middlewares rather than BaseHTTPMiddleware
+subclasses: BaseHTTPMiddleware bridges every response body through an
+anyio memory-object stream, costing an extra task per request. None of
+these middlewares touch the body, so they wrap `send` directly.
+"""
+
+import os
 
 import structlog
-from fastapi import Request, Response
+from fastapi import Request
 from fastapi.responses import RedirectResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from .core.config import settings
+from starlette.datastructures import URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .logging_config import reset_request_context, set_request_context
 
 
 logger = structlog.get_logger(__name__)
 
+_REQUEST_ID_HEADER = b"x-request-id"
+_FORWARDED_PROTO_HEADER = b"x-forwarded-proto"
+
+
+def _get_header(scope: Scope, name: bytes) -> bytes | None:
+    """Linear scan of the raw header list; avoids building a Headers map."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """Middleware to add unique request ID for tracing and logging with structlog."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Add X-Request-ID header to request/response and bind to logging context."""
-        # Check if request already has an ID (from proxy/load balancer)
-        request_id = request.headers.get("X-Request-ID")
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Generate new ID if not provided
-        if not request_id:
-            request_id = str(uuid.uuid4())
+        # Check if request already has an ID (from proxy/load balancer).
+        # Generated IDs are 128 random bits as hex: same entropy as a
+        # uuid4 without the UUID object construction and str() dance.
+        header_value = _get_header(scope, _REQUEST_ID_HEADER)
+        request_id = header_value.decode("latin-1") if header_value else os.urandom(16).hex()
 
         # Store in request state for access in route handlers
-        request.state.request_id = request_id
-
-        # Bind to logging context (will be included in all logs for this request)
-        structlog.contextvars.clear_contextvars()
-        structlog.contextvars.bind_contextvars(
-            request_id=request_id,
-            method=request.method,
-            path=request.url.path,
-            client_ip=request.client.host if request.client else None,
-        )
-
-        # Log request start
-        logger.info(
-            "request_started",
-            method=request.method,
-            path=request.url.path,
-            query_params=str(request.query_params) if request.query_params else None,
-        )
-
-        # Process request
-        try:
-            response = await call_next(request)
-
-            # Log request completion
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        # Bind to logging context (will be included in all logs for this
+        # request): one ContextVar set with a prebuilt dict
+        client = scope.get("client")
+        ctx_token = set_request_context({
+            "request_id": request_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "client_ip": client[0] if client else None,
+        })
+
+        # Log request start. The raw query_string bytes come straight
+        # off the scope (no QueryParams parsing/formatting), and the
+        # decode is skipped entirely for query-less requests — the
+        # common case — which also keeps the key out of the log line.
+        if query_string := scope.get("query_string"):
             logger.info(
-                "request_completed",
-                status_code=response.status_code,
+                "request_started",
+                method=scope["method"],
+                path=scope["path"],
+                query_params=query_string.decode("latin-1"),
             )
+        else:
+            logger.info("request_started", method=scope["method"], path=scope["path"])
+
+        request_id_bytes = request_id.encode("latin-1")
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Log request completion
+                logger.info(
+                    "request_completed",
+                    status_code=message["status"],
+                )
+                # Add request ID to response headers for client correlation
+                message["headers"].append((_REQUEST_ID_HEADER, request_id_bytes))
+            await send(message)
 
-            # Add request ID to response headers for client correlation
-            response.headers["X-Request-ID"] = request_id
-
-            return response
-
+        # Process request
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
             # Log request error
             logger.error(
@@ -69,26 +101,72 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
             )
             raise
         finally:
-            # Clear context vars after request
-            structlog.contextvars.clear_contextvars()
-
-
-class HTTPSRedirectMiddleware(BaseHTTPMiddleware):
-    """Middleware to redirect HTTP requests to HTTPS in production."""
-
-    async def dispatch(self, request: Request, call_next):
-        """Redirect HTTP to HTTPS if in production environment."""
-        if settings.app_env == "prod":
+            # Restore the previous logging context
+            reset_request_context(ctx_token)
+
+
+# First path segments of the legacy (unversioned) API, mapped onto /v1
+_LEGACY_ROOTS = frozenset({
+    "/auth",
+    "/users",
+    "/availability",
+    "/notifications",
+    "/dogs",
+    "/messages",
+    "/ws",
+})
+
+
+class LegacyPathRewriteMiddleware:
+    """Rewrite legacy unversioned paths (/auth/...) onto /v1 in place.
+
+    Registering every router twice doubled the route table, and
+    Starlette matches routes with a linear scan per request. Rewriting
+    the scope path before routing keeps the legacy URLs working while
+    only the /v1 routes exist.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            # First segment only ("/auth/login" -> "/auth"); segment
+            # boundaries keep e.g. "/authors" untouched
+            cut = path.find("/", 1)
+            root = path if cut == -1 else path[:cut]
+            if root in _LEGACY_ROOTS:
+                scope["path"] = "/v1" + path
+                if "raw_path" in scope:
+                    scope["raw_path"] = b"/v1" + scope["raw_path"]
+        await self.app(scope, receive, send)
+
+
+class HTTPSRedirectMiddleware:
+    """Middleware to redirect HTTP requests to HTTPS.
+
+    Only registered in production (see create_app), so there is no
+    per-request environment check here.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Redirect plain-HTTP requests to their HTTPS equivalent."""
+        if scope["type"] == "http":
             # Check if request is HTTP (not HTTPS)
             # Handle both direct HTTPS and proxy scenarios (X-Forwarded-Proto header)
-            forwarded_proto = request.headers.get("X-Forwarded-Proto", "")
-            scheme = forwarded_proto if forwarded_proto else request.url.scheme
+            forwarded_proto = _get_header(scope, _FORWARDED_PROTO_HEADER)
+            scheme = forwarded_proto.decode("latin-1") if forwarded_proto else scope.get("scheme", "http")
 
             if scheme == "http":
                 # Build HTTPS URL
-                https_url = request.url.replace(scheme="https")
-                return RedirectResponse(url=str(https_url), status_code=301)
+                https_url = URL(scope=scope).replace(scheme="https")
+                response = RedirectResponse(url=str(https_url), status_code=301)
+                await response(scope, receive, send)
+                return
 
         # Process request normally
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
@@ -1,6 +1,8 @@
 import secrets
+import time
+import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, Boolean, Integer, Text, UniqueConstraint, Index
+from sqlalchemy import Enum, String, DateTime, ForeignKey, Boolean, Integer, LargeBinary, Text, UniqueConstraint, Index, Uuid, func, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 import enum
 
@@ -19,29 +21,84 @@ class MatchStatus(str, enum.Enum):
 
 
 def generate_user_id() -> str:
-    """Generate a cryptographically secure random user ID.
-
-    Uses secrets.token_urlsafe(16) which produces ~21 characters of URL-safe
-    base64-encoded random data. This is much more secure than truncated UUIDs
-    and prevents user enumeration attacks.
+    """Generate a time-ordered (UUIDv7) user ID.
+
+    Layout per the UUIDv7 draft: 48-bit millisecond timestamp, then 74
+    random bits. Time-ordered keys append at the right edge of the
+    primary-key B-tree instead of splitting random pages, and the
+    native uuid column is a fixed 16 bytes on PostgreSQL versus the
+    ~21-char token_urlsafe strings it replaces — every FK index that
+    references users shrinks with it. The 74 random bits still make
+    ids unguessable; only the creation instant is exposed.
     """
-    return secrets.token_urlsafe(16)
+    ts_ms = time.time_ns() // 1_000_000
+    value = (
+        ((ts_ms & 0xFFFFFFFFFFFF) << 80)
+        | (0x7 << 76)
+        | (secrets.randbits(12) << 64)
+        | (0b10 << 62)
+        | secrets.randbits(62)
+    )
+    return str(uuid.UUID(int=value))
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Partial indexes: almost every row has NULL tokens, so indexing
+        # only the live ones keeps these B-trees tiny and off the write
+        # path for ordinary updates (the WHERE clause applies on
+        # PostgreSQL; other dialects fall back to full indexes).
+        Index(
+            'ix_users_email_verification_token',
+            'email_verification_token',
+            postgresql_where=text('email_verification_token IS NOT NULL'),
+        ),
+        Index(
+            'ix_users_password_reset_token',
+            'password_reset_token',
+            postgresql_where=text('password_reset_token IS NOT NULL'),
+        ),
+        # Bounding-box support for proximity queries: a lat-leading
+        # composite lets "users near me" filter on an index range scan
+        # instead of reading every row. Partial, since users without a
+        # location can never match.
+        Index(
+            'ix_users_location',
+            'location_lat',
+            'location_lng',
+            postgresql_where=text('location_lat IS NOT NULL'),
+        ),
+        # Logins are case-insensitive: lookups compare lower(email), and
+        # this expression index keeps that an O(log N) probe instead of
+        # a seq scan with per-row lower(). Unique at the normalized
+        # form, so Alice@x.com can't register next to alice@x.com; it
+        # replaces the old plain unique index on email.
+        Index('ix_users_email_lower', func.lower(text('email')), unique=True),
+    )
 
-    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=generate_user_id)
-    email: Mapped[str] = mapped_column(String(254), unique=True, index=True, nullable=False)
+    # as_uuid=False keeps the Python-side value a plain string (JWT
+    # subjects, path params and schemas all treat ids as str); the
+    # storage is still a native 16-byte uuid on PostgreSQL.
+    id: Mapped[str] = mapped_column(Uuid(as_uuid=False), primary_key=True, default=generate_user_id)
+    # Stored lowercased (normalized at the auth endpoints); uniqueness
+    # is enforced by ix_users_email_lower above
+    email: Mapped[str] = mapped_column(String(254), nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    # Account status, toggled by the admin CLI for moderation
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     # Email verification fields
     email_verified: Mapped[bool] = mapped_column(default=False, nullable=False)
-    email_verification_token: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    # SHA-256 digests of the tokens, never the raw values: a DB read
+    # can't hijack in-flight verifications/resets, and 32-byte binary
+    # keys pack the index tighter than 43-char text.
+    email_verification_token: Mapped[bytes | None] = mapped_column(LargeBinary(32), nullable=True)
 
     # Password reset fields
-    password_reset_token: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    password_reset_token: Mapped[bytes | None] = mapped_column(LargeBinary(32), nullable=True)
     password_reset_expires: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     # Profile fields (dogs moved to separate table with ownership links)
@@ -73,38 +130,63 @@ class User(Base):
 
 class AvailabilityOffer(Base):
     __tablename__ = "availability_offers"
+    __table_args__ = (
+        # The overlap/containment checks, the match scans and the
+        # date-filtered searches all predicate on the time window; a
+        # composite (start_at, end_at) turns those from full scans into
+        # range scans on the leading bound, with end_at available for
+        # index-level filtering.
+        Index('ix_availability_offers_window', 'start_at', 'end_at'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
     start_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     end_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     user: Mapped[User] = relationship(back_populates="offers")
 
 
 class AvailabilityRequest(Base):
     __tablename__ = "availability_requests"
+    __table_args__ = (
+        # Mirror of ix_availability_offers_window, for the same
+        # window-predicate scans from the request side.
+        Index('ix_availability_requests_window', 'start_at', 'end_at'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
     start_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     end_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     user: Mapped[User] = relationship(back_populates="requests")
 
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # The polling hot path is "unread for this user, newest first";
+        # unread rows are a sliver of the table, so the partial index
+        # stays tiny on PostgreSQL. The plain user_id index remains for
+        # the all-notifications view.
+        Index(
+            'ix_notifications_unread',
+            'user_id',
+            'created_at',
+            postgresql_where=text('is_read = false'),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     user: Mapped[User] = relationship(back_populates="notifications")
 
@@ -118,7 +200,7 @@ class Dog(Base):
     birth_month: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-12
     birth_year: Mapped[int] = mapped_column(Integer, nullable=False)  # e.g., 2020
     sex: Mapped[str] = mapped_column(String(6), nullable=False)  # 'male' or 'female'
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     user_links: Mapped[list["UserDog"]] = relationship(back_populates="dog", cascade="all, delete-orphan")
 
@@ -147,7 +229,7 @@ class UserDog(Base):
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), primary_key=True)
     dog_id: Mapped[int] = mapped_column(ForeignKey("dogs.id"), primary_key=True)
     is_owner: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     user: Mapped[User] = relationship(back_populates="dog_links")
     dog: Mapped[Dog] = relationship(back_populates="user_links")
@@ -168,19 +250,34 @@ class Match(Base):
         UniqueConstraint('offer_id', 'request_id', name='uq_offer_request'),
         Index('ix_matches_offer_id', 'offer_id'),
         Index('ix_matches_request_id', 'request_id'),
-        Index('ix_matches_status', 'status'),
+        # Only the live states are ever queried by status; terminal
+        # matches (confirmed/rejected) accumulate forever and stay out
+        # of this index on PostgreSQL.
+        Index(
+            'ix_matches_status',
+            'status',
+            postgresql_where=text("status IN ('pending', 'accepted')"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     offer_id: Mapped[int] = mapped_column(ForeignKey("availability_offers.id"), nullable=False)
     request_id: Mapped[int] = mapped_column(ForeignKey("availability_requests.id"), nullable=False)
-    status: Mapped[str] = mapped_column(String(20), nullable=False, default=MatchStatus.PENDING.value)
+    # Native enum: 4-byte OIDs on PostgreSQL instead of variable-length
+    # text, so rows and the status index shrink and comparisons are
+    # integer equality. values_callable persists the lowercase .value
+    # strings the API already exposes, not the member names.
+    status: Mapped[MatchStatus] = mapped_column(
+        Enum(MatchStatus, name='match_status', values_callable=lambda e: [m.value for m in e]),
+        nullable=False,
+        default=MatchStatus.PENDING,
+    )
 
     # Track who needs to respond
     pending_user_id: Mapped[str | None] = mapped_column(ForeignKey("users.id"), nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     offer: Mapped[AvailabilityOffer] = relationship()
@@ -196,11 +293,13 @@ class Message(Base):
     """
     __tablename__ = "messages"
     __table_args__ = (
-        Index('ix_messages_sender_id', 'sender_id'),
-        Index('ix_messages_recipient_id', 'recipient_id'),
         Index('ix_messages_created_at', 'created_at'),
-        # Composite index for fetching conversations
+        # Conversations are queried in both directions (A→B and B→A),
+        # so the composite index needs a mirror; each also serves as
+        # the single-column index for its leading key, so the old
+        # standalone sender/recipient indexes are gone.
         Index('ix_messages_conversation', 'sender_id', 'recipient_id', 'created_at'),
+        Index('ix_messages_conversation_rev', 'recipient_id', 'sender_id', 'created_at'),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -208,7 +307,7 @@ class Message(Base):
     recipient_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     sender: Mapped[User] = relationship(foreign_keys=[sender_id], back_populates="sent_messages")
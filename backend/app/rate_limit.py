@@ -1,21 +1,43 @@
-"""Rate limiting utilities using SlowAPI with in-memory storage.
+"""Rate limiting utilities using SlowAPI.
 
-For serverless/low-traffic deployments, we use in-memory rate limiting
-instead of Redis to reduce costs and complexity.
+Storage defaults to in-memory (no Redis needed) for dev and
+single-instance deployments. Under multiple workers each process keeps
+its own counters, so a "5/minute" limit is effectively 5 x workers;
+point RATE_LIMIT_STORAGE_URI at a shared backend (e.g.
+redis://host:6379) to enforce limits globally.
 """
 import os
+from fastapi import Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from .db import get_db
+
 # Disable rate limiting in test environment
 enabled = os.getenv("TESTING") != "1"
 
-# Initialize rate limiter with in-memory storage (no Redis needed)
-# For serverless: rate limits are per Lambda instance, which is acceptable
-# for low traffic. If you need distributed rate limiting across instances,
-# consider using PostgreSQL-backed storage instead.
 limiter = Limiter(
     key_func=get_remote_address,
-    storage_uri="memory://",  # In-memory storage (no Redis)
+    storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://"),
     enabled=enabled
 )
+
+
+def get_db_rate_limited(request: Request):
+    """get_db, but the route's rate limit is checked first.
+
+    ``@limiter.limit`` fires inside the endpoint wrapper, after FastAPI
+    has resolved ``Depends(get_db)``, so a brute-force burst against
+    /login still acquires one pooled connection per rejected attempt.
+    Running the same check here, before get_db yields, turns an
+    over-limit request into a 429 that never touches the pool. Setting
+    the completion flag makes the decorator skip its own check (no
+    double counting); the decorator still injects the rate-limit
+    headers on success.
+    """
+    if limiter.enabled and not getattr(request.state, "_rate_limiting_complete", False):
+        endpoint = request.scope.get("endpoint")
+        if endpoint is not None:
+            limiter._check_request_limit(request, endpoint, False)
+            request.state._rate_limiting_complete = True
+    yield from get_db()
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form, Request, Response
+import base64
+import hashlib
 import os
 import re
 import secrets
 from datetime import datetime, timedelta, timezone
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..db import get_db
@@ -12,100 +17,161 @@ from ..schemas import UserCreate, UserOut, ForgotPasswordRequest, ResetPasswordR
 from ..security import hash_password, verify_password, create_access_token
 from ..services import storage as storage_mod
 from ..services.email import send_email
-from ..rate_limit import limiter
+from ..rate_limit import get_db_rate_limited, limiter
 
 
 router = APIRouter()
 
+# Dog name format: uppercase letters/digits ending with two digits.
+# Compiled once; the call site then skips re's per-call cache lookup.
+_DOG_NAME_RE = re.compile(r"[A-Z0-9]{1,98}[0-9]{2}")
+
+
+# Hash verified against when login hits an unknown email, so both
+# branches pay the same bcrypt cost and response timing can't be used
+# to enumerate accounts. Built on first use rather than at import to
+# keep the bcrypt work off cold start.
+_dummy_hash: str | None = None
+
+
+def _get_dummy_hash() -> str:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("not-a-real-password")
+    return _dummy_hash
+
+
+def _hash_token(token: str) -> bytes:
+    """Digest stored in place of verification/reset tokens.
+
+    The raw token only ever travels in the emailed URL; the DB holds
+    its SHA-256, so a database read can't impersonate the link.
+    """
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _mint_token() -> tuple[str, bytes]:
+    """Return a fresh (url_token, stored_digest) pair.
+
+    Builds the URL form from token_bytes directly and hashes the ascii
+    bytes in one pass, instead of token_urlsafe followed by a
+    str->bytes re-encode; the digest matches _hash_token(url_token).
+    """
+    ascii_token = base64.urlsafe_b64encode(secrets.token_bytes(32)).rstrip(b"=")
+    return ascii_token.decode("ascii"), hashlib.sha256(ascii_token).digest()
+
 
 @router.post("/register", response_model=UserOut)
 @limiter.limit("5/minute")
-def register(request: Request, user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(request: Request, user_in: UserCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db_rate_limited)):
     from ..core.config import settings
 
-    if db.query(User).filter(User.email == user_in.email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
-
     # Generate email verification token
-    verification_token = secrets.token_urlsafe(32)
+    verification_token, verification_digest = _mint_token()
+
+    # bcrypt is ~100ms of pure CPU: run it on the threadpool so the
+    # event loop keeps serving other requests while it grinds
+    password_hash = await run_in_threadpool(hash_password, user_in.password)
 
     user = User(
-        email=user_in.email,
-        password_hash=hash_password(user_in.password),
+        # Normalized at write time so equality against lower(email) is
+        # exact for every row written from here on
+        email=user_in.email.lower(),
+        password_hash=password_hash,
         location_lat=user_in.location_lat,
         location_lng=user_in.location_lng,
         email_verified=False,
-        email_verification_token=verification_token,
+        email_verification_token=verification_digest,
     )
+    # No SELECT pre-check: the unique index on users.email is the
+    # authority (a pre-check would race anyway), so just insert and
+    # translate the constraint violation.
     db.add(user)
-    db.flush()  # get user id
+    try:
+        db.flush()  # get user id
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
 
-    # Optional: create a Dog linked to the user if dog_name provided
+    # Optional: create a Dog linked to the user if dog_name provided.
+    # Core inserts with RETURNING: one round-trip per table instead of
+    # a flush per ORM row.
     if user_in.dog_name:
         from datetime import datetime
         name = user_in.dog_name.upper()
         # Use defaults for quick registration (user can update later)
         current_year = datetime.now().year
-        dog = Dog(
-            name=name,
-            birth_month=1,  # January (placeholder)
-            birth_year=current_year - 2,  # Assume ~2 years old
-            sex="male"  # Placeholder (user can update)
-        )
-        db.add(dog)
-        db.flush()
-        db.add(UserDog(user_id=user.id, dog_id=dog.id, is_owner=True))
+        dog_id = db.execute(
+            insert(Dog)
+            .values(
+                name=name,
+                birth_month=1,  # January (placeholder)
+                birth_year=current_year - 2,  # Assume ~2 years old
+                sex="male",  # Placeholder (user can update)
+            )
+            .returning(Dog.id)
+        ).scalar_one()
+        db.execute(insert(UserDog).values(user_id=user.id, dog_id=dog_id, is_owner=True))
 
     db.commit()
-    db.refresh(user)
 
     # Build verification URL
-    frontend_url = settings.cors_origins.split(",")[0].strip() if settings.cors_origins else "http://localhost:5173"
+    frontend_url = settings.frontend_url
     verification_url = f"{frontend_url}/verify-email/{verification_token}"
 
-    # Send verification email
-    send_email(
+    # Send verification email after the response is flushed: SMTP
+    # round-trips stay off the request path
+    background_tasks.add_task(
+        send_email,
         user.email,
         "Regami - Verify Your Email / Verifiez votre email",
         template="email/verify_email.html",
         context={
             "user_email": user.email,
             "verification_url": verification_url,
-        }
+        },
     )
     return user
 
 
 @router.post("/register-multipart", response_model=UserOut)
 @limiter.limit("5/minute")
-def register_multipart(
+async def register_multipart(
     request: Request,
+    background_tasks: BackgroundTasks,
     email: str = Form(...),
     password: str = Form(...),
     dog_name: str | None = Form(default=None),
     location_lat: float | None = Form(default=None),
     location_lng: float | None = Form(default=None),
     file: UploadFile | None = File(default=None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_rate_limited),
 ):
     from ..core.config import settings
 
-    if db.query(User).filter(User.email == email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
-
     # Generate email verification token
-    verification_token = secrets.token_urlsafe(32)
+    verification_token, verification_digest = _mint_token()
+
+    # Threadpool bcrypt, as in register
+    password_hash = await run_in_threadpool(hash_password, password)
 
     user = User(
-        email=email,
-        password_hash=hash_password(password),
+        # Normalized at write time, as in register
+        email=email.lower(),
+        password_hash=password_hash,
         location_lat=location_lat,
         location_lng=location_lng,
         email_verified=False,
-        email_verification_token=verification_token,
+        email_verification_token=verification_digest,
     )
+    # Insert directly and let the unique index on users.email report
+    # duplicates (see register)
     db.add(user)
-    db.flush()
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
 
     photo_url: str | None = None
     if file is not None:
@@ -127,47 +193,59 @@ def register_multipart(
     if dog_name:
         from datetime import datetime
         name = dog_name.upper()
-        # Validate pattern: uppercase letters/digits ending with two digits
-        if not re.fullmatch(r"^[A-Z0-9]{1,98}[0-9]{2}$", name):
+        if not _DOG_NAME_RE.fullmatch(name):
             raise HTTPException(status_code=400, detail="Invalid dog name format")
-        # Use defaults for quick registration (user can update later)
+        # Use defaults for quick registration (user can update later);
+        # core inserts as in register: one round-trip per table
         current_year = datetime.now().year
-        dog = Dog(
-            name=name,
-            photo_url=photo_url,
-            birth_month=1,  # January (placeholder)
-            birth_year=current_year - 2,  # Assume ~2 years old
-            sex="male"  # Placeholder (user can update)
-        )
-        db.add(dog)
-        db.flush()
-        db.add(UserDog(user_id=user.id, dog_id=dog.id, is_owner=True))
+        dog_id = db.execute(
+            insert(Dog)
+            .values(
+                name=name,
+                photo_url=photo_url,
+                birth_month=1,  # January (placeholder)
+                birth_year=current_year - 2,  # Assume ~2 years old
+                sex="male",  # Placeholder (user can update)
+            )
+            .returning(Dog.id)
+        ).scalar_one()
+        db.execute(insert(UserDog).values(user_id=user.id, dog_id=dog_id, is_owner=True))
 
     db.commit()
-    db.refresh(user)
 
     # Build verification URL
-    frontend_url = settings.cors_origins.split(",")[0].strip() if settings.cors_origins else "http://localhost:5173"
+    frontend_url = settings.frontend_url
     verification_url = f"{frontend_url}/verify-email/{verification_token}"
 
-    # Send verification email
-    send_email(
+    # Send verification email after the response is flushed: SMTP
+    # round-trips stay off the request path
+    background_tasks.add_task(
+        send_email,
         user.email,
         "Regami - Verify Your Email / Verifiez votre email",
         template="email/verify_email.html",
         context={
             "user_email": user.email,
             "verification_url": verification_url,
-        }
+        },
     )
     return user
 
 
 @router.post("/login")
 @limiter.limit("10/minute")
-def login(request: Request, response: Response, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+async def login(request: Request, response: Response, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db_rate_limited)):
+    # Case-insensitive lookup; lower(email) hits the functional index
+    # ix_users_email_lower, so this stays an index probe
+    user = db.scalar(select(User).where(func.lower(User.email) == form_data.username.lower()))
+    if not user:
+        # Burn the same bcrypt work as the found-user branch; a fast
+        # 401 here would leak which emails exist. On the threadpool so
+        # concurrent logins don't serialize behind each other's bcrypt.
+        dummy = await run_in_threadpool(_get_dummy_hash)
+        await run_in_threadpool(verify_password, form_data.password, dummy)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if not await run_in_threadpool(verify_password, form_data.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     access_token = create_access_token(subject=user.id)
@@ -221,7 +299,7 @@ def logout(response: Response):
 
 @router.post("/forgot-password")
 @limiter.limit("3/minute")
-def forgot_password(request: Request, data: ForgotPasswordRequest, db: Session = Depends(get_db)):
+def forgot_password(request: Request, data: ForgotPasswordRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db_rate_limited)):
     """
     Request a password reset email.
 
@@ -229,31 +307,33 @@ def forgot_password(request: Request, data: ForgotPasswordRequest, db: Session =
     """
     from ..core.config import settings
 
-    user = db.query(User).filter(User.email == data.email).first()
+    user = db.scalar(select(User).where(func.lower(User.email) == data.email.lower()))
 
     if user:
         # Generate secure reset token
-        reset_token = secrets.token_urlsafe(32)
+        reset_token, reset_digest = _mint_token()
 
-        # Set token and expiration (1 hour from now)
-        user.password_reset_token = reset_token
+        # Set token hash and expiration (1 hour from now); the raw
+        # token only goes into the emailed URL
+        user.password_reset_token = reset_digest
         user.password_reset_expires = datetime.now(timezone.utc) + timedelta(hours=1)
         db.commit()
 
         # Build reset URL
         # Use frontend URL, not API URL
-        frontend_url = settings.cors_origins.split(",")[0].strip() if settings.cors_origins else "http://localhost:5173"
+        frontend_url = settings.frontend_url
         reset_url = f"{frontend_url}/reset-password/{reset_token}"
 
-        # Send reset email
-        send_email(
+        # Send reset email off the request path
+        background_tasks.add_task(
+            send_email,
             user.email,
             "Regami - Password Reset / Reinitialisation du mot de passe",
             template="email/password_reset.html",
             context={
                 "user_email": user.email,
                 "reset_url": reset_url,
-            }
+            },
         )
 
     # Always return success to prevent email enumeration
@@ -262,12 +342,12 @@ def forgot_password(request: Request, data: ForgotPasswordRequest, db: Session =
 
 @router.post("/reset-password")
 @limiter.limit("5/minute")
-def reset_password(request: Request, data: ResetPasswordRequest, db: Session = Depends(get_db)):
+async def reset_password(request: Request, data: ResetPasswordRequest, db: Session = Depends(get_db_rate_limited)):
     """
     Reset password using a valid reset token.
     """
-    # Find user with matching token
-    user = db.query(User).filter(User.password_reset_token == data.token).first()
+    # Find user with matching token (DB stores the SHA-256 digest)
+    user = db.scalar(select(User).where(User.password_reset_token == _hash_token(data.token)))
 
     if not user:
         raise HTTPException(
@@ -297,8 +377,8 @@ def reset_password(request: Request, data: ResetPasswordRequest, db: Session = D
             detail="Reset token has expired. Please request a new one."
         )
 
-    # Update password
-    user.password_hash = hash_password(data.new_password)
+    # Update password (bcrypt on the threadpool, as in register/login)
+    user.password_hash = await run_in_threadpool(hash_password, data.new_password)
 
     # Clear reset token
     user.password_reset_token = None
@@ -310,12 +390,12 @@ def reset_password(request: Request, data: ResetPasswordRequest, db: Session = D
 
 
 @router.post("/verify-email/{token}")
-def verify_email(token: str, db: Session = Depends(get_db)):
+def verify_email(token: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """
     Verify email address using the verification token.
     """
-    # Find user with matching token
-    user = db.query(User).filter(User.email_verification_token == token).first()
+    # Find user with matching token (DB stores the SHA-256 digest)
+    user = db.scalar(select(User).where(User.email_verification_token == _hash_token(token)))
 
     if not user:
         raise HTTPException(
@@ -331,12 +411,13 @@ def verify_email(token: str, db: Session = Depends(get_db)):
     user.email_verification_token = None
     db.commit()
 
-    # Send welcome email now that email is verified
-    send_email(
+    # Send welcome email now that email is verified, off the request path
+    background_tasks.add_task(
+        send_email,
         user.email,
         "Bienvenue / Welcome to Regami",
         template="email/welcome.html",
-        context={"user_email": user.email}
+        context={"user_email": user.email},
     )
 
     return {"message": "Email verified successfully. Welcome to Regami!"}
@@ -344,7 +425,7 @@ def verify_email(token: str, db: Session = Depends(get_db)):
 
 @router.post("/resend-verification")
 @limiter.limit("3/minute")
-def resend_verification(request: Request, data: ResendVerificationRequest, db: Session = Depends(get_db)):
+def resend_verification(request: Request, data: ResendVerificationRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db_rate_limited)):
     """
     Resend email verification link.
 
@@ -352,27 +433,28 @@ def resend_verification(request: Request, data: ResendVerificationRequest, db: S
     """
     from ..core.config import settings
 
-    user = db.query(User).filter(User.email == data.email).first()
+    user = db.scalar(select(User).where(func.lower(User.email) == data.email.lower()))
 
     if user and not user.email_verified:
-        # Generate new verification token
-        verification_token = secrets.token_urlsafe(32)
-        user.email_verification_token = verification_token
+        # Generate new verification token; store only its digest
+        verification_token, verification_digest = _mint_token()
+        user.email_verification_token = verification_digest
         db.commit()
 
         # Build verification URL
-        frontend_url = settings.cors_origins.split(",")[0].strip() if settings.cors_origins else "http://localhost:5173"
+        frontend_url = settings.frontend_url
         verification_url = f"{frontend_url}/verify-email/{verification_token}"
 
-        # Send verification email
-        send_email(
+        # Send verification email off the request path
+        background_tasks.add_task(
+            send_email,
             user.email,
             "Regami - Verify Your Email / Verifiez votre email",
             template="email/verify_email.html",
             context={
                 "user_email": user.email,
                 "verification_url": verification_url,
-            }
+            },
         )
 
     # Always return success to prevent email enumeration
@@ -1,12 +1,14 @@
+import base64
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
 from pydantic import BaseModel
-from sqlalchemy import and_, asc, desc
-from sqlalchemy.orm import Session
+from sqlalchemy import asc, desc, func, literal, select, tuple_
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from typing import Optional
 
 from ..db import get_db
-from ..models import AvailabilityOffer, AvailabilityRequest, Match, MatchStatus, Notification, User
+from ..models import AvailabilityOffer, AvailabilityRequest, Match, MatchStatus, Notification, User, UserDog
 from .users import get_current_user
 from ..services.email import send_email
 from .. import fcm
@@ -49,21 +51,65 @@ class MatchOut(BaseModel):
     requester_email: str | None = None
 
 
-def _notify(db: Session, user: User, message: str) -> None:
-    """Create a notification and send email (legacy plain text)."""
+def _encode_cursor(value: datetime, row_id: int) -> str:
+    """Opaque keyset cursor: sort-column value and id of the last row."""
+    return base64.urlsafe_b64encode(f"{value.isoformat()}|{row_id}".encode()).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        value, _, row_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode().partition("|")
+        return datetime.fromisoformat(value), int(row_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _keyset_page(db: Session, stmt, order_col, id_col, cursor: str | None, page_size: int, is_desc: bool):
+    """Fetch one keyset page, returning (rows, next_cursor).
+
+    A row-value comparison against the cursor replaces OFFSET, so page
+    N costs the same as page 1 instead of scanning and discarding
+    N * page_size rows first; the id column breaks sort-value ties so
+    the ordering is total and no row is skipped or repeated.
+    """
+    direction = desc if is_desc else asc
+    stmt = stmt.order_by(direction(order_col), direction(id_col))
+    if cursor:
+        value, row_id = _decode_cursor(cursor)
+        marker = tuple_(order_col, id_col)
+        stmt = stmt.where(marker < (value, row_id) if is_desc else marker > (value, row_id))
+    rows = db.scalars(stmt.limit(page_size)).all()
+    next_cursor = None
+    if len(rows) == page_size:
+        last = rows[-1]
+        next_cursor = _encode_cursor(getattr(last, order_col.key), last.id)
+    return rows, next_cursor
+
+
+def _notify(db: Session, background_tasks: BackgroundTasks, user: User, message: str) -> None:
+    """Create a notification and queue the email (legacy plain text)."""
     notif = Notification(user_id=user.id, message=message)
     db.add(notif)
-    send_email(user.email, "Regami - Nouvelle correspondance", body=message)
+    background_tasks.add_task(
+        send_email, user.email, "Regami - Nouvelle correspondance", body=message
+    )
 
 
 def _send_match_email(
     db: Session,
+    background_tasks: BackgroundTasks,
     user: User,
     template: str,
     subject: str,
     match: Match
 ) -> None:
-    """Send HTML email for match-related notifications."""
+    """Queue an HTML email for match-related notifications.
+
+    The Notification row rides in the request's transaction, but the
+    SMTP round-trip runs after the response is sent — it no longer
+    holds the request (or any row locks) open. The template context is
+    resolved here, while the ORM objects are at hand.
+    """
     notif = Notification(user_id=user.id, message=subject)
     db.add(notif)
 
@@ -75,150 +121,154 @@ def _send_match_email(
         "requester_email": match.request.user.email if match.request and match.request.user else "",
     }
 
-    send_email(user.email, subject, template=template, context=context)
+    background_tasks.add_task(send_email, user.email, subject, template=template, context=context)
 
 
-def _create_match(db: Session, offer: AvailabilityOffer, request: AvailabilityRequest) -> Match:
-    """Create a pending match with transaction-level locking.
+# Column order shared by the two bulk match inserts below
+_MATCH_INSERT_COLS = ["offer_id", "request_id", "status", "pending_user_id"]
 
-    Uses SELECT FOR UPDATE to prevent race conditions where two users
-    might try to match with the same offer/request simultaneously.
+
+def _bulk_create_matches(db: Session, candidate_select) -> list:
+    """Insert matches for every candidate row in one round-trip.
+
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING collapses
+    the old per-candidate lock/check/insert sequence (~5 queries each)
+    into a single statement; the unique constraint on (offer_id,
+    request_id) provides the atomicity the row locks used to.
     """
-    # Lock both offer and request rows to prevent concurrent matches
-    locked_offer = (
-        db.query(AvailabilityOffer)
-        .filter(AvailabilityOffer.id == offer.id)
-        .with_for_update()
-        .first()
-    )
-    locked_request = (
-        db.query(AvailabilityRequest)
-        .filter(AvailabilityRequest.id == request.id)
-        .with_for_update()
-        .first()
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = (
+        dialect_insert(Match)
+        .from_select(_MATCH_INSERT_COLS, candidate_select)
+        .on_conflict_do_nothing(index_elements=["offer_id", "request_id"])
+        .returning(Match.id, Match.offer_id, Match.request_id)
     )
+    return db.execute(stmt).all()
 
-    if not locked_offer or not locked_request:
-        raise HTTPException(status_code=404, detail="Offer or request no longer available")
 
-    # Check if match already exists (shouldn't happen with unique constraint, but safe check)
-    existing = (
-        db.query(Match)
-        .filter(
-            Match.offer_id == offer.id,
-            Match.request_id == request.id,
-            Match.status.in_([MatchStatus.PENDING.value, MatchStatus.ACCEPTED.value])
-        )
-        .first()
-    )
-    if existing:
-        return existing
-
-    # Create new match in pending state
-    # Offer owner needs to respond first
-    match = Match(
-        offer_id=offer.id,
-        request_id=request.id,
-        status=MatchStatus.PENDING.value,
-        pending_user_id=offer.user_id  # Offer owner responds first
-    )
-    db.add(match)
-    db.flush()  # Get the ID without committing
+def _notify_match_created(
+    db: Session,
+    background_tasks: BackgroundTasks,
+    offer: AvailabilityOffer,
+    requester: User,
+    match_id: int,
+) -> None:
+    """Notification row plus queued email/push for a new pending match."""
+    owner = offer.user
+    subject = "Regami - Nouvelle demande de garde"
+    db.add(Notification(user_id=owner.id, message=subject))
 
-    # Notify offer owner with HTML email
-    _send_match_email(
-        db,
-        locked_offer.user,
-        "email/match_pending.html",
-        "Regami - Nouvelle demande de garde",
-        match
+    context = {
+        "user_email": owner.email,
+        "start_date": offer.start_at.strftime('%Y-%m-%d %H:%M'),
+        "end_date": offer.end_at.strftime('%Y-%m-%d %H:%M'),
+        "offer_owner_email": owner.email,
+        "requester_email": requester.email,
+    }
+    background_tasks.add_task(
+        send_email, owner.email, subject, template="email/match_pending.html", context=context
     )
 
-    # Send push notification to offer owner
-    requester_dog = _get_user_first_dog(locked_request.user)
-    fcm.notify_new_match(
+    requester_dog = _get_user_first_dog(requester)
+    background_tasks.add_task(
+        fcm.notify_new_match,
         db=db,
-        user_id=locked_offer.user_id,
-        match_id=str(match.id),
-        dog_name=requester_dog.name if requester_dog else "un chien"
+        user_id=owner,
+        match_id=str(match_id),
+        dog_name=requester_dog.name if requester_dog else "un chien",
     )
 
-    return match
 
-
-def _match_offer(db: Session, offer: AvailabilityOffer) -> list[Match]:
-    """Find requests that fit within offer window and create pending matches."""
-    created_matches = []
-
-    # Find requests that fit within offer window (with locking)
-    requests = (
-        db.query(AvailabilityRequest)
-        .filter(
-            and_(
-                AvailabilityRequest.start_at >= offer.start_at,
-                AvailabilityRequest.end_at <= offer.end_at,
-                AvailabilityRequest.user_id != offer.user_id,
-            )
-        )
-        .all()
+def _match_offer(db: Session, background_tasks: BackgroundTasks, offer: AvailabilityOffer) -> list[int]:
+    """Create pending matches for every request that fits the offer window."""
+    cols = Match.__table__.c
+    candidates = select(
+        literal(offer.id, cols.offer_id.type),
+        AvailabilityRequest.id,
+        literal(MatchStatus.PENDING.value, cols.status.type),
+        # Offer owner responds first
+        literal(offer.user_id, cols.pending_user_id.type),
+    ).where(
+        AvailabilityRequest.start_at >= offer.start_at,
+        AvailabilityRequest.end_at <= offer.end_at,
+        AvailabilityRequest.user_id != offer.user_id,
     )
-
-    for req in requests:
-        try:
-            match = _create_match(db, offer, req)
-            created_matches.append(match)
-        except HTTPException:
-            # Skip if match already exists or other error
-            continue
-
-    return created_matches
-
-
-def _match_request(db: Session, request: AvailabilityRequest) -> list[Match]:
-    """Find offers that contain the requested window and create pending matches."""
-    created_matches = []
-
-    # Find offers that contain the requested window
-    offers = (
-        db.query(AvailabilityOffer)
-        .filter(
-            and_(
-                AvailabilityOffer.start_at <= request.start_at,
-                AvailabilityOffer.end_at >= request.end_at,
-                AvailabilityOffer.user_id != request.user_id,
+    created = _bulk_create_matches(db, candidates)
+    if not created:
+        return []
+
+    # One batched load of the matched requesters (with their dogs, read
+    # by _notify_match_created) to drive notifications
+    requesters = {
+        req.id: req.user
+        for req in db.scalars(
+            select(AvailabilityRequest)
+            .where(AvailabilityRequest.id.in_([row.request_id for row in created]))
+            .options(
+                joinedload(AvailabilityRequest.user)
+                .selectinload(User.dog_links)
+                .joinedload(UserDog.dog)
             )
         )
-        .all()
+    }
+    for match_id, _offer_id, request_id in created:
+        _notify_match_created(db, background_tasks, offer, requesters[request_id], match_id)
+
+    return [row.id for row in created]
+
+
+def _match_request(db: Session, background_tasks: BackgroundTasks, request: AvailabilityRequest) -> list[int]:
+    """Create pending matches for every offer that contains the requested window."""
+    cols = Match.__table__.c
+    candidates = select(
+        AvailabilityOffer.id,
+        literal(request.id, cols.request_id.type),
+        literal(MatchStatus.PENDING.value, cols.status.type),
+        # Offer owner responds first
+        AvailabilityOffer.user_id,
+    ).where(
+        AvailabilityOffer.start_at <= request.start_at,
+        AvailabilityOffer.end_at >= request.end_at,
+        AvailabilityOffer.user_id != request.user_id,
     )
+    created = _bulk_create_matches(db, candidates)
+    if not created:
+        return []
+
+    # One batched load of the matched offers (and owners) for notifications
+    offers = {
+        off.id: off
+        for off in db.scalars(
+            select(AvailabilityOffer)
+            .where(AvailabilityOffer.id.in_([row.offer_id for row in created]))
+            .options(joinedload(AvailabilityOffer.user))
+        )
+    }
+    for match_id, offer_id, _request_id in created:
+        _notify_match_created(db, background_tasks, offers[offer_id], request.user, match_id)
 
-    for off in offers:
-        try:
-            match = _create_match(db, off, request)
-            created_matches.append(match)
-        except HTTPException:
-            # Skip if match already exists or other error
-            continue
-
-    return created_matches
+    return [row.id for row in created]
 
 
 @router.post("/offers", response_model=dict)
-def create_offer(slot: SlotIn, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_offer(slot: SlotIn, background_tasks: BackgroundTasks, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     if not slot.valid:
         raise HTTPException(status_code=400, detail="Invalid time range")
     # Prevent past and overlapping windows
     now = datetime.utcnow()
     if slot.end_at <= now or slot.start_at <= now:
         raise HTTPException(status_code=400, detail="Time range must be in the future")
-    overlap = (
-        db.query(AvailabilityOffer)
-        .filter(
+    overlap = db.scalar(
+        select(AvailabilityOffer).where(
             AvailabilityOffer.user_id == current_user.id,
             # overlap if start < existing.end and end > existing.start
             AvailabilityOffer.start_at < slot.end_at,
             AvailabilityOffer.end_at > slot.start_at,
         )
-        .first()
     )
     if overlap:
         raise HTTPException(status_code=400, detail="Overlapping offer exists")
@@ -226,27 +276,25 @@ def create_offer(slot: SlotIn, db: Session = Depends(get_db), current_user: User
     db.add(offer)
     db.commit()
     db.refresh(offer)
-    _match_offer(db, offer)
+    _match_offer(db, background_tasks, offer)
     db.commit()
     return {"id": offer.id}
 
 
 @router.post("/requests", response_model=dict)
-def create_request(slot: SlotIn, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_request(slot: SlotIn, background_tasks: BackgroundTasks, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     if not slot.valid:
         raise HTTPException(status_code=400, detail="Invalid time range")
     # Prevent past and overlapping windows
     now = datetime.utcnow()
     if slot.end_at <= now or slot.start_at <= now:
         raise HTTPException(status_code=400, detail="Time range must be in the future")
-    overlap = (
-        db.query(AvailabilityRequest)
-        .filter(
+    overlap = db.scalar(
+        select(AvailabilityRequest).where(
             AvailabilityRequest.user_id == current_user.id,
             AvailabilityRequest.start_at < slot.end_at,
             AvailabilityRequest.end_at > slot.start_at,
         )
-        .first()
     )
     if overlap:
         raise HTTPException(status_code=400, detail="Overlapping request exists")
@@ -254,7 +302,7 @@ def create_request(slot: SlotIn, db: Session = Depends(get_db), current_user: Us
     db.add(req)
     db.commit()
     db.refresh(req)
-    _match_request(db, req)
+    _match_request(db, background_tasks, req)
     db.commit()
     return {"id": req.id}
 
@@ -283,25 +331,31 @@ def delete_request(request_id: int, db: Session = Depends(get_db), current_user:
 def my_offers(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    page: int = 1,
+    cursor: str | None = None,
     page_size: int = 20,
     sort: str = "-start_at",  # - for desc
+    include_total: bool = False,
 ):
-    q = db.query(AvailabilityOffer).filter(AvailabilityOffer.user_id == current_user.id)
-    total = q.count()
-    order_col = AvailabilityOffer.start_at
-    order = desc(order_col) if sort.startswith('-') else asc(order_col)
-    items = (
-        q.order_by(order)
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+    mine = AvailabilityOffer.user_id == current_user.id
+    # COUNT(*) only when asked for; most pages don't need it
+    total = (
+        db.scalar(select(func.count()).select_from(AvailabilityOffer).where(mine))
+        if include_total else None
+    )
+    items, next_cursor = _keyset_page(
+        db,
+        select(AvailabilityOffer).where(mine),
+        AvailabilityOffer.start_at,
+        AvailabilityOffer.id,
+        cursor,
+        page_size,
+        sort.startswith('-'),
     )
     return {
         "items": [{"id": r.id, "start_at": r.start_at.isoformat(), "end_at": r.end_at.isoformat()} for r in items],
         "total": total,
-        "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
     }
 
 
@@ -309,25 +363,30 @@ def my_offers(
 def my_requests(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    page: int = 1,
+    cursor: str | None = None,
     page_size: int = 20,
     sort: str = "-start_at",
+    include_total: bool = False,
 ):
-    q = db.query(AvailabilityRequest).filter(AvailabilityRequest.user_id == current_user.id)
-    total = q.count()
-    order_col = AvailabilityRequest.start_at
-    order = desc(order_col) if sort.startswith('-') else asc(order_col)
-    items = (
-        q.order_by(order)
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+    mine = AvailabilityRequest.user_id == current_user.id
+    total = (
+        db.scalar(select(func.count()).select_from(AvailabilityRequest).where(mine))
+        if include_total else None
+    )
+    items, next_cursor = _keyset_page(
+        db,
+        select(AvailabilityRequest).where(mine),
+        AvailabilityRequest.start_at,
+        AvailabilityRequest.id,
+        cursor,
+        page_size,
+        sort.startswith('-'),
     )
     return {
         "items": [{"id": r.id, "start_at": r.start_at.isoformat(), "end_at": r.end_at.isoformat()} for r in items],
         "total": total,
-        "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
     }
 
 
@@ -339,9 +398,10 @@ def search_offers(
     start_date: Optional[datetime] = Query(None, description="Filter by start date (>=)"),
     end_date: Optional[datetime] = Query(None, description="Filter by end date (<=)"),
     exclude_mine: bool = Query(False, description="Exclude current user's offers"),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the previous page"),
     page_size: int = Query(20, ge=1, le=100),
     sort: str = Query("-start_at", description="Sort field (prefix with - for desc)"),
+    include_total: bool = Query(False, description="Also return the total row count"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -351,22 +411,26 @@ def search_offers(
     - start_date: Filter offers starting on or after this date
     - end_date: Filter offers ending on or before this date
     - exclude_mine: Don't include current user's offers
+    - cursor: Opaque next_cursor value from the previous page
     - sort: Sort by field (start_at, end_at, created_at). Prefix with - for descending
     """
-    query = db.query(AvailabilityOffer)
+    filters = []
 
     # Filter by date range
     if start_date:
-        query = query.filter(AvailabilityOffer.start_at >= start_date)
+        filters.append(AvailabilityOffer.start_at >= start_date)
     if end_date:
-        query = query.filter(AvailabilityOffer.end_at <= end_date)
+        filters.append(AvailabilityOffer.end_at <= end_date)
 
     # Exclude current user's offers
     if exclude_mine:
-        query = query.filter(AvailabilityOffer.user_id != current_user.id)
+        filters.append(AvailabilityOffer.user_id != current_user.id)
 
-    # Get total count
-    total = query.count()
+    # Total only when asked for; the COUNT(*) is the expensive part
+    total = (
+        db.scalar(select(func.count()).select_from(AvailabilityOffer).where(*filters))
+        if include_total else None
+    )
 
     # Sorting
     sort_field = sort.lstrip('-')
@@ -381,15 +445,15 @@ def search_offers(
     else:
         order_col = AvailabilityOffer.start_at
 
-    order = desc(order_col) if is_desc else asc(order_col)
-
-    # Pagination
-    items = (
-        query
-        .order_by(order)
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+    # Keyset pagination on (sort column, id)
+    items, next_cursor = _keyset_page(
+        db,
+        select(AvailabilityOffer).where(*filters),
+        order_col,
+        AvailabilityOffer.id,
+        cursor,
+        page_size,
+        is_desc,
     )
 
     return {
@@ -404,9 +468,9 @@ def search_offers(
             for r in items
         ],
         "total": total,
-        "page": page,
         "page_size": page_size,
-        "has_more": (page * page_size) < total
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
     }
 
 
@@ -415,9 +479,10 @@ def search_requests(
     start_date: Optional[datetime] = Query(None, description="Filter by start date (>=)"),
     end_date: Optional[datetime] = Query(None, description="Filter by end date (<=)"),
     exclude_mine: bool = Query(False, description="Exclude current user's requests"),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the previous page"),
     page_size: int = Query(20, ge=1, le=100),
     sort: str = Query("-start_at", description="Sort field (prefix with - for desc)"),
+    include_total: bool = Query(False, description="Also return the total row count"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -427,22 +492,26 @@ def search_requests(
     - start_date: Filter requests starting on or after this date
     - end_date: Filter requests ending on or before this date
     - exclude_mine: Don't include current user's requests
+    - cursor: Opaque next_cursor value from the previous page
     - sort: Sort by field (start_at, end_at, created_at). Prefix with - for descending
     """
-    query = db.query(AvailabilityRequest)
+    filters = []
 
     # Filter by date range
     if start_date:
-        query = query.filter(AvailabilityRequest.start_at >= start_date)
+        filters.append(AvailabilityRequest.start_at >= start_date)
     if end_date:
-        query = query.filter(AvailabilityRequest.end_at <= end_date)
+        filters.append(AvailabilityRequest.end_at <= end_date)
 
     # Exclude current user's requests
     if exclude_mine:
-        query = query.filter(AvailabilityRequest.user_id != current_user.id)
+        filters.append(AvailabilityRequest.user_id != current_user.id)
 
-    # Get total count
-    total = query.count()
+    # Total only when asked for; the COUNT(*) is the expensive part
+    total = (
+        db.scalar(select(func.count()).select_from(AvailabilityRequest).where(*filters))
+        if include_total else None
+    )
 
     # Sorting
     sort_field = sort.lstrip('-')
@@ -457,15 +526,15 @@ def search_requests(
     else:
         order_col = AvailabilityRequest.start_at
 
-    order = desc(order_col) if is_desc else asc(order_col)
-
-    # Pagination
-    items = (
-        query
-        .order_by(order)
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+    # Keyset pagination on (sort column, id)
+    items, next_cursor = _keyset_page(
+        db,
+        select(AvailabilityRequest).where(*filters),
+        order_col,
+        AvailabilityRequest.id,
+        cursor,
+        page_size,
+        is_desc,
     )
 
     return {
@@ -480,12 +549,36 @@ def search_requests(
             for r in items
         ],
         "total": total,
-        "page": page,
         "page_size": page_size,
-        "has_more": (page * page_size) < total
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
     }
 
 
+def _lock_match(db: Session, match_id: int) -> Match | None:
+    """Lock one match row for a state transition.
+
+    On PostgreSQL this emits FOR NO KEY UPDATE OF matches NOWAIT:
+    key_share doesn't block concurrent inserts referencing the row,
+    of= keeps any joined rows unlocked, and NOWAIT turns a lock queue
+    into an immediate 409 the client can retry instead of a worker
+    parked behind someone else's transaction. SQLite ignores the
+    locking clause entirely.
+    """
+    try:
+        return db.scalar(
+            select(Match)
+            .where(Match.id == match_id)
+            .with_for_update(of=Match, key_share=True, nowait=True)
+        )
+    except OperationalError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Match is being updated, please retry",
+        )
+
+
 # ========== Match Management Endpoints (Two-Way Confirmation) ==========
 
 
@@ -493,26 +586,39 @@ def search_requests(
 def get_pending_matches(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    page: int = 1,
+    cursor: str | None = None,
     page_size: int = 20,
+    include_total: bool = False,
 ):
     """Get all matches where current user needs to respond."""
-    q = (
-        db.query(Match)
-        .filter(
-            Match.pending_user_id == current_user.id,
-            Match.status.in_([MatchStatus.PENDING.value, MatchStatus.ACCEPTED.value])
-        )
-        .join(Match.offer)
-        .join(Match.request)
+    filters = (
+        Match.pending_user_id == current_user.id,
+        Match.status.in_([MatchStatus.PENDING.value, MatchStatus.ACCEPTED.value]),
     )
 
-    total = q.count()
-    items = (
-        q.order_by(Match.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+    total = (
+        db.scalar(select(func.count()).select_from(Match).where(*filters))
+        if include_total else None
+    )
+    # The response reads offer, request and both users per match; eager
+    # loading fetches the whole page in one query instead of up to four
+    # lazy-load round-trips per row. contains_eager reuses the joins
+    # already needed by the statement.
+    items, next_cursor = _keyset_page(
+        db,
+        select(Match)
+        .join(Match.offer)
+        .join(Match.request)
+        .options(
+            contains_eager(Match.offer).joinedload(AvailabilityOffer.user),
+            contains_eager(Match.request).joinedload(AvailabilityRequest.user),
+        )
+        .where(*filters),
+        Match.created_at,
+        Match.id,
+        cursor,
+        page_size,
+        True,
     )
 
     result_items = []
@@ -536,8 +642,8 @@ def get_pending_matches(
     return {
         "items": result_items,
         "total": total,
-        "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
     }
 
 
@@ -545,31 +651,51 @@ def get_pending_matches(
 def get_my_matches(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    page: int = 1,
+    cursor: str | None = None,
     page_size: int = 20,
     status_filter: str | None = None,
+    include_total: bool = False,
 ):
     """Get all matches involving current user's offers or requests."""
     # Get matches where user is either offer owner or requester
-    q = (
-        db.query(Match)
+    # Eager-load the rows the response reads per match (see
+    # get_pending_matches): one query for the page instead of N+1
+    stmt = (
+        select(Match)
         .join(Match.offer)
         .join(Match.request)
-        .filter(
+        .options(
+            contains_eager(Match.offer).joinedload(AvailabilityOffer.user),
+            contains_eager(Match.request).joinedload(AvailabilityRequest.user),
+        )
+        .where(
             (AvailabilityOffer.user_id == current_user.id) |
             (AvailabilityRequest.user_id == current_user.id)
         )
     )
 
     if status_filter:
-        q = q.filter(Match.status == status_filter)
-
-    total = q.count()
-    items = (
-        q.order_by(Match.updated_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+        # Client-supplied; validate before it reaches the native
+        # match_status bind, which errors on unknown values instead of
+        # matching nothing the way the old text column did
+        try:
+            status_value = MatchStatus(status_filter)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid status filter")
+        stmt = stmt.where(Match.status == status_value)
+
+    total = (
+        db.scalar(select(func.count()).select_from(stmt.subquery()))
+        if include_total else None
+    )
+    items, next_cursor = _keyset_page(
+        db,
+        stmt,
+        Match.updated_at,
+        Match.id,
+        cursor,
+        page_size,
+        True,
     )
 
     result_items = []
@@ -595,25 +721,21 @@ def get_my_matches(
     return {
         "items": result_items,
         "total": total,
-        "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
     }
 
 
 @router.post("/matches/{match_id}/accept", response_model=dict)
 def accept_match(
     match_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Accept a pending match (offer owner accepts request)."""
-    # Lock the match row
-    match = (
-        db.query(Match)
-        .filter(Match.id == match_id)
-        .with_for_update()
-        .first()
-    )
+    # Lock the match row (fail fast if someone else holds it)
+    match = _lock_match(db, match_id)
 
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
@@ -634,20 +756,24 @@ def accept_match(
     db.add(match)
     db.flush()
 
-    # Notify requester with HTML email
+    # Notify requester with HTML email (queued, runs after the response)
     _send_match_email(
         db,
+        background_tasks,
         match.request.user,
         "email/match_accepted.html",
         "Regami - Votre demande a été acceptée!",
         match
     )
 
-    # Send push notification to requester
+    # Queue push notification to requester. Pass the loaded User, not
+    # the id: by the time the task runs the request's session is closed,
+    # and resolving an id would open (and leak) a fresh transaction.
     offer_dog = _get_user_first_dog(match.offer.user)
-    fcm.notify_match_accepted(
+    background_tasks.add_task(
+        fcm.notify_match_accepted,
         db=db,
-        user_id=match.request.user_id,
+        user_id=match.request.user,
         match_id=str(match.id),
         dog_name=offer_dog.name if offer_dog else "un chien"
     )
@@ -664,17 +790,13 @@ def accept_match(
 @router.post("/matches/{match_id}/confirm", response_model=dict)
 def confirm_match(
     match_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Confirm an accepted match (requester confirms)."""
-    # Lock the match row
-    match = (
-        db.query(Match)
-        .filter(Match.id == match_id)
-        .with_for_update()
-        .first()
-    )
+    # Lock the match row (fail fast if someone else holds it)
+    match = _lock_match(db, match_id)
 
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
@@ -695,9 +817,10 @@ def confirm_match(
     db.add(match)
     db.flush()
 
-    # Notify both parties with HTML email
+    # Notify both parties with HTML email (queued, runs after the response)
     _send_match_email(
         db,
+        background_tasks,
         match.offer.user,
         "email/match_confirmed.html",
         "Regami - Garde confirmée!",
@@ -705,24 +828,27 @@ def confirm_match(
     )
     _send_match_email(
         db,
+        background_tasks,
         match.request.user,
         "email/match_confirmed.html",
         "Regami - Garde confirmée!",
         match
     )
 
-    # Send push notifications to both parties
+    # Queue push notifications to both parties
     offer_dog = _get_user_first_dog(match.offer.user)
     request_dog = _get_user_first_dog(match.request.user)
-    fcm.notify_match_confirmed(
+    background_tasks.add_task(
+        fcm.notify_match_confirmed,
         db=db,
-        user_id=match.offer.user_id,
+        user_id=match.offer.user,
         match_id=str(match.id),
         dog_name=request_dog.name if request_dog else "un chien"
     )
-    fcm.notify_match_confirmed(
+    background_tasks.add_task(
+        fcm.notify_match_confirmed,
         db=db,
-        user_id=match.request.user_id,
+        user_id=match.request.user,
         match_id=str(match.id),
         dog_name=offer_dog.name if offer_dog else "un chien"
     )
@@ -740,17 +866,13 @@ def confirm_match(
 @router.post("/matches/{match_id}/reject", response_model=dict)
 def reject_match(
     match_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Reject a match (either party can reject)."""
-    # Lock the match row
-    match = (
-        db.query(Match)
-        .filter(Match.id == match_id)
-        .with_for_update()
-        .first()
-    )
+    # Lock the match row (fail fast if someone else holds it)
+    match = _lock_match(db, match_id)
 
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
@@ -774,20 +896,23 @@ def reject_match(
     db.add(match)
     db.flush()
 
-    # Notify the other party with HTML email
+    # Notify the other party with HTML email (queued, runs after the response)
     other_user = match.offer.user if is_requester else match.request.user
     _send_match_email(
         db,
+        background_tasks,
         other_user,
         "email/match_rejected.html",
         "Regami - Demande de garde annulée",
         match
     )
 
-    # Send push notification to the other party
-    fcm.notify_match_rejected(
+    # Queue push notification to the other party (loaded User, not the
+    # id — see accept_match)
+    background_tasks.add_task(
+        fcm.notify_match_rejected,
         db=db,
-        user_id=other_user.id,
+        user_id=other_user,
         match_id=str(match.id)
     )
 
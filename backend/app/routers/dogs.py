@@ -8,7 +8,7 @@ import math
 from ..db import get_db
 from ..models import Dog, UserDog, User
 from ..schemas import DogCreate, DogUpdate, DogOut
-from .users import get_current_user
+from .users import get_current_user, get_user_by_id
 from ..services import storage as storage_mod
 
 router = APIRouter()
@@ -119,7 +119,7 @@ def upload_dog_photo(
 @router.post("/{dog_id}/coowners/{user_id}", status_code=200)
 def add_coowner(dog_id: int, user_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     _ = _ensure_owner(db, current_user.id, dog_id)
-    if not db.get(User, user_id):
+    if not get_user_by_id(db, user_id):
         raise HTTPException(status_code=404, detail="User not found")
     existing = db.query(UserDog).filter(and_(UserDog.user_id == user_id, UserDog.dog_id == dog_id)).first()
     if existing:
@@ -134,6 +134,10 @@ def add_coowner(dog_id: int, user_id: str, db: Session = Depends(get_db), curren
 @router.delete("/{dog_id}/coowners/{user_id}", status_code=200)
 def remove_coowner(dog_id: int, user_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     _ = _ensure_owner(db, current_user.id, dog_id)
+    # Malformed ids would error in PostgreSQL's uuid cast below, so a
+    # user that can't exist means the link doesn't either
+    if not get_user_by_id(db, user_id):
+        raise HTTPException(status_code=404, detail="Link not found")
     link = db.query(UserDog).filter(and_(UserDog.user_id == user_id, UserDog.dog_id == dog_id)).first()
     if not link:
         raise HTTPException(status_code=404, detail="Link not found")
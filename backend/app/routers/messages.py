@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
@@ -7,7 +8,7 @@ from sqlalchemy.orm import Session
 from ..db import get_db
 from ..models import Message, User
 from ..schemas import MessageCreate, MessageResponse, ConversationSummary
-from .users import get_current_user
+from .users import get_current_user, get_user_by_id
 from .websocket import notify_new_message
 from .. import fcm
 
@@ -23,7 +24,7 @@ async def send_message(
 ):
     """Send a message to another user."""
     # Verify recipient exists
-    recipient = db.get(User, message_data.recipient_id)
+    recipient = get_user_by_id(db, message_data.recipient_id)
     if not recipient:
         raise HTTPException(status_code=404, detail="Recipient not found")
 
@@ -57,10 +58,12 @@ async def send_message(
         "created_at": message.created_at.isoformat(),
     })
 
-    # Send push notification to recipient
-    fcm.notify_new_message(
+    # Send push notification to recipient; offload the blocking FCM
+    # round-trip so it doesn't stall the event loop
+    await asyncio.to_thread(
+        fcm.notify_new_message,
         db=db,
-        user_id=recipient.id,
+        user_id=recipient,
         sender_name=current_user.email.split('@')[0],  # Use email username as name
         message_preview=message.content
     )
@@ -147,7 +150,7 @@ def get_conversation_thread(
 ):
     """Get full message thread with a specific user."""
     # Verify other user exists
-    other_user = db.get(User, other_user_id)
+    other_user = get_user_by_id(db, other_user_id)
     if not other_user:
         raise HTTPException(status_code=404, detail="User not found")
 
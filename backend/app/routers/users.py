@@ -1,3 +1,5 @@
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Cookie, Header
 from sqlalchemy.orm import Session
 from .. import schemas
@@ -15,6 +17,20 @@ from ..sentry_config import set_user_context
 router = APIRouter()
 
 
+def get_user_by_id(db: Session, user_id: str) -> User | None:
+    """db.get(User, ...) that treats a malformed id as not found.
+
+    User ids are uuids; on PostgreSQL an unparseable client-supplied
+    string would error in the uuid cast rather than simply miss. Use
+    this for any id taken from a path param or request body.
+    """
+    try:
+        uuid.UUID(user_id)
+    except (ValueError, TypeError):
+        return None
+    return db.get(User, user_id)
+
+
 async def get_current_user_ws(token: str, db: Session) -> User:
     """Get current authenticated user for WebSocket connections.
 
@@ -1,4 +1,5 @@
 import smtplib
+import time
 from email.message import EmailMessage
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
@@ -10,6 +11,12 @@ from ..core.config import settings
 TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
 jinja_env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
 
+# Retry budget: with the 3s connect timeout below, the worst case per
+# send is bounded (~3 attempts x timeout + backoff), so a slow mail
+# provider can't pin a worker thread indefinitely.
+_SEND_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.5  # seconds, doubled per attempt
+
 
 def send_email(
     to_email: str,
@@ -46,9 +53,19 @@ def send_email(
     else:
         msg.set_content(body or "")
 
-    try:
-        with smtplib.SMTP(host, port, timeout=3) as s:
-            s.send_message(msg)
-    except Exception:
-        # In tests or local dev without SMTP, silently ignore.
-        return
+    # Runs from background tasks (see auth router), so retries never
+    # sit on the request path. Transient SMTP hiccups get a short
+    # exponential backoff; after the budget is spent, give up quietly
+    # (tests and local dev have no SMTP server).
+    for attempt in range(_SEND_ATTEMPTS):
+        try:
+            with smtplib.SMTP(host, port, timeout=3) as s:
+                s.send_message(msg)
+            return
+        except ConnectionRefusedError:
+            # Nothing is listening (tests, local dev without SMTP);
+            # retrying seconds later won't change that.
+            return
+        except Exception:
+            if attempt + 1 < _SEND_ATTEMPTS:
+                time.sleep(_RETRY_BASE_DELAY * (2 ** attempt))
@@ -73,12 +73,10 @@ def test_delete_offer_and_request_with_ownership():
     # Lists should be empty
     r = client1.get("/availability/offers/mine")
     assert r.status_code == 200
-    data = r.json()
-    assert data["total"] == 0
+    assert r.json()["items"] == []
     r = client1.get("/availability/requests/mine")
     assert r.status_code == 200
-    data = r.json()
-    assert data["total"] == 0
+    assert r.json()["items"] == []
 
 
 def test_validation_invalid_and_overlapping_and_past():
@@ -56,23 +56,35 @@ def test_offers_pagination_and_sort():
         assert r.status_code == 200
 
     # Desc sort (default): latest first - GET doesn't need CSRF
-    r = client.get("/availability/offers/mine?page=1&page_size=2")
+    r = client.get("/availability/offers/mine?page_size=2&include_total=true")
     data = r.json()
     assert data["total"] == 5
     assert len(data["items"]) == 2
+    assert data["next_cursor"]
     first_page = data["items"]
 
-    r = client.get("/availability/offers/mine?page=2&page_size=2")
+    r = client.get(f"/availability/offers/mine?page_size=2&cursor={data['next_cursor']}")
     data2 = r.json()
     assert len(data2["items"]) == 2
     # Ensure order is descending by start_at
     assert first_page[0]["start_at"] > data2["items"][0]["start_at"]
+    # Keyset pages never repeat rows
+    assert {i["id"] for i in first_page}.isdisjoint({i["id"] for i in data2["items"]})
 
-    # Asc sort
-    r = client.get("/availability/offers/mine?page=1&page_size=1&sort=start_at")
+    # Asc sort: follow the cursor chain to the last row
+    r = client.get("/availability/offers/mine?page_size=1&sort=start_at")
     asc_first = r.json()["items"][0]["start_at"]
-    r = client.get("/availability/offers/mine?page=5&page_size=1&sort=start_at")
-    asc_last = r.json()["items"][0]["start_at"]
+    asc_last = asc_first
+    cursor = r.json()["next_cursor"]
+    seen = 1
+    while cursor:
+        r = client.get(f"/availability/offers/mine?page_size=1&sort=start_at&cursor={cursor}")
+        items = r.json()["items"]
+        if items:
+            asc_last = items[0]["start_at"]
+            seen += 1
+        cursor = r.json()["next_cursor"]
+    assert seen == 5
     assert asc_first < asc_last
 
 
@@ -91,13 +103,19 @@ def test_requests_pagination_and_sort():
         )
         assert r.status_code == 200
 
-    r = client.get("/availability/requests/mine?page=1&page_size=2")
+    r = client.get("/availability/requests/mine?page_size=2&include_total=true")
     data = r.json()
     assert data["total"] == 3
     assert len(data["items"]) == 2
-    # Asc
-    r = client.get("/availability/requests/mine?page=1&page_size=1&sort=start_at")
+    # Asc: follow the cursor chain to the last row
+    r = client.get("/availability/requests/mine?page_size=1&sort=start_at")
     first = r.json()["items"][0]["start_at"]
-    r = client.get("/availability/requests/mine?page=3&page_size=1&sort=start_at")
-    last = r.json()["items"][0]["start_at"]
+    last = first
+    cursor = r.json()["next_cursor"]
+    while cursor:
+        r = client.get(f"/availability/requests/mine?page_size=1&sort=start_at&cursor={cursor}")
+        items = r.json()["items"]
+        if items:
+            last = items[0]["start_at"]
+        cursor = r.json()["next_cursor"]
     assert first < last